@@ -0,0 +1,117 @@
+"""
+Content-hashed asset copies (hero-bg.webp -> hero-bg.3f9a1c2b.webp).
+Writes the name -> hashed-name manifest read by src/lib/image-manifest.ts
+and the immutable Cache-Control headers block in vercel.json.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from staged_output import StagedRun, rewrite_shared
+
+ROOT = Path(__file__).parent.parent
+PUBLIC_DIR = ROOT / "public"
+MANIFEST_FILE = ROOT / "src" / "lib" / "image-manifest.json"
+VERCEL_FILE = ROOT / "vercel.json"
+
+HASH_LENGTH = 8
+HASHED_RE = re.compile(r"\.[0-9a-f]{%d}$" % HASH_LENGTH)
+HASHED_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp", ".avif")
+
+IMMUTABLE_SOURCE = r"/(.*)\.([0-9a-f]{%d})\.(jpg|jpeg|png|webp|avif)" % HASH_LENGTH
+IMMUTABLE_HEADERS = [{"key": "Cache-Control", "value": "public, max-age=31536000, immutable"}]
+
+
+def is_hashed(path: Path) -> bool:
+    """True for copies written by write_hashed_copy (name.<hash>.ext)."""
+    return bool(HASHED_RE.search(path.stem))
+
+
+def bytes_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def content_hash(path: Path) -> str:
+    return bytes_hash(path.read_bytes())
+
+
+def write_hashed_copy(path: Path) -> Path:
+    """Copy path to name.<hash>.ext next to it and drop stale hashed copies."""
+    with StagedRun("asset-hash") as run:
+        # One read under the asset lock: the name is the hash of exactly the bytes written
+        with run.read(path):
+            data = path.read_bytes()
+        hashed = path.with_name(f"{path.stem}.{bytes_hash(data)}{path.suffix}")
+
+        for old in path.parent.glob(f"{path.stem}.*{path.suffix}"):
+            if old != hashed and is_hashed(old) and old.stem[:-HASH_LENGTH - 1] == path.stem:
+                old.unlink()
+
+        if not hashed.exists():
+            run.stage(hashed, source=path).write_bytes(data)
+    return hashed
+
+
+def public_url(path: Path) -> str:
+    return "/" + path.relative_to(PUBLIC_DIR).as_posix()
+
+
+def is_current(url: str, hashed_url: str) -> bool:
+    """True while the hashed copy exists and still carries the hash of its source."""
+    source, hashed = PUBLIC_DIR / url.lstrip("/"), PUBLIC_DIR / hashed_url.lstrip("/")
+    if not source.is_file() or not hashed.is_file():
+        return False
+    return hashed.stem[-HASH_LENGTH:] == content_hash(source)
+
+
+def update_manifest(copies: dict) -> None:
+    """Merge {original_path: hashed_path} into the manifest module's JSON."""
+    def update(text):
+        manifest = json.loads(text) if text else {}
+        for original, hashed in copies.items():
+            manifest[public_url(original)] = public_url(hashed)
+
+        # Forget entries whose hashed file is gone or whose source changed since
+        manifest = {k: v for k, v in manifest.items() if is_current(k, v)}
+        return json.dumps(dict(sorted(manifest.items())), indent=2) + "\n"
+
+    rewrite_shared(MANIFEST_FILE, update)
+
+
+def manifest_in_use() -> bool:
+    """True once a --hashed run has filled the manifest the components resolve through."""
+    if not MANIFEST_FILE.exists():
+        return False
+    return bool(json.loads(MANIFEST_FILE.read_text(encoding="utf-8")))
+
+
+def refresh_hashed(sources) -> dict:
+    """Hashed copies of sources and their WebP siblings, merged into the manifest."""
+    outputs = {f for s in sources for f in (s, s.with_suffix(".webp")) if f.exists()}
+    copies = {f: write_hashed_copy(f) for f in sorted(outputs)}
+    update_manifest(copies)
+    return copies
+
+
+def update_vercel_headers() -> None:
+    """Ensure vercel.json serves hashed paths with an immutable Cache-Control."""
+    def update(text):
+        config = json.loads(text)
+
+        headers = [h for h in config.get("headers", []) if h.get("source") != IMMUTABLE_SOURCE]
+        headers.append({"source": IMMUTABLE_SOURCE, "headers": IMMUTABLE_HEADERS})
+        config["headers"] = headers
+
+        # Same layout as the hand-written file: one rule per line
+        blocks = []
+        for key, value in config.items():
+            if isinstance(value, list):
+                items = ",\n".join(f"    {{ {json.dumps(item)[1:-1]} }}" for item in value)
+                blocks.append(f'  {json.dumps(key)}: [\n{items}\n  ]')
+            else:
+                blocks.append(f"  {json.dumps(key)}: {json.dumps(value)}")
+        return "{\n" + ",\n".join(blocks) + "\n}\n"
+
+    rewrite_shared(VERCEL_FILE, update)
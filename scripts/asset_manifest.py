@@ -0,0 +1,27 @@
+"""
+Build-side asset manifest (scripts/asset-manifest.json).
+Analysis tools record their per-asset decisions here, one section per tool.
+"""
+
+import json
+from pathlib import Path
+
+from staged_output import rewrite_shared
+
+MANIFEST_FILE = Path(__file__).parent / "asset-manifest.json"
+
+
+def load_manifest() -> dict:
+    if not MANIFEST_FILE.exists():
+        return {}
+    return json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+
+
+def update_section(section: str, entries: dict) -> None:
+    """Merge {asset: record} into one section of the manifest (locked, atomic)."""
+    def update(text):
+        manifest = json.loads(text) if text else {}
+        manifest[section] = dict(sorted({**manifest.get(section, {}), **entries}.items()))
+        return json.dumps(manifest, indent=2) + "\n"
+
+    rewrite_shared(MANIFEST_FILE, update)
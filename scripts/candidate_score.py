@@ -0,0 +1,70 @@
+"""
+Local scoring of generated icon candidates.
+Each candidate gets its fake background removed (fix-transparency) and is
+scored on real alpha, background share, clean edges and brand colours.
+"""
+
+import numpy as np
+from PIL import Image
+
+from script_loader import load_script
+
+_fix = load_script("fix_transparency", "fix-transparency.py")
+
+BRAND_COLORS = np.array([(0x7c, 0x3a, 0xed), (0x3b, 0x82, 0xf6)], dtype=np.float32)  # #7c3aed, #3b82f6
+MAX_COLOR_DISTANCE = 255 * 3 ** 0.5
+
+# Share of the canvas that should be background for a centred icon
+BACKGROUND_RANGE = (0.3, 0.9)
+EDGE_BAND = 4  # px around the border that should be fully transparent
+
+WEIGHTS = {"alpha": 0.3, "background": 0.25, "edges": 0.25, "palette": 0.2}
+
+
+def clean_background(img):
+    """Return (RGBA image with the fake background removed, detection or None)."""
+    img = img.convert('RGBA')
+    # Candidates often come back on plain white; only its border-connected part is cleared
+    detection = _fix.detect_checkerboard(img, allow_solid=True)
+    if not detection:
+        return img, None
+
+    arr = np.array(img)
+    _fix.remove_background(arr, detection)
+    return Image.fromarray(arr, 'RGBA'), detection
+
+
+def score_candidate(img):
+    """Score an RGBA candidate (after clean_background); returns (total, parts)."""
+    arr = np.asarray(img)
+    alpha = arr[:, :, 3]
+    transparent = alpha == 0
+
+    parts = {}
+    parts["alpha"] = 1.0 if transparent.any() else 0.0
+
+    share = float(transparent.mean())
+    low, high = BACKGROUND_RANGE
+    if low <= share <= high:
+        parts["background"] = 1.0
+    else:
+        gap = low - share if share < low else share - high
+        parts["background"] = max(0.0, 1 - gap / low)
+
+    border = np.concatenate([
+        alpha[:EDGE_BAND].ravel(), alpha[-EDGE_BAND:].ravel(),
+        alpha[:, :EDGE_BAND].ravel(), alpha[:, -EDGE_BAND:].ravel(),
+    ])
+    parts["edges"] = float((border == 0).mean())
+
+    # Brand distance of saturated opaque pixels (outlines and whites don't count)
+    rgb = arr[:, :, :3][alpha > 128].astype(np.float32)
+    saturated = rgb[(rgb.max(axis=1) - rgb.min(axis=1)) > 40]
+    if len(saturated):
+        distance = np.linalg.norm(saturated[:, None, :] - BRAND_COLORS[None], axis=2).min(axis=1)
+        parts["palette"] = float(1 - np.median(distance) / MAX_COLOR_DISTANCE)
+    else:
+        parts["palette"] = 0.0
+
+    total = sum(WEIGHTS[k] * v for k, v in parts.items())
+    return total, parts
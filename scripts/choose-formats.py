@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Pick the output format for each image from its content instead of its extension.
+Cheap pixel statistics (unique colors, alpha usage, edge density, gradient
+smoothness) classify the image, only the top candidate encodes are tried at
+the shipped size, and the decision is recorded in asset-manifest.json.
+"""
+
+import argparse
+import io
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, features
+
+from asset_hash import is_hashed
+from asset_manifest import update_section
+from encode_pool import encode_all
+from resize_engine import open_resized, psnr
+from script_loader import load_script
+
+IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
+
+get_settings = load_script("optimize_images", "optimize-images.py").get_settings
+
+# Statistics run on a nearest-neighbour sample so no new colors are invented
+STATS_MAX_SIDE = 512
+PALETTE_COLORS = 256        # fits an exact palette PNG
+PHOTO_COLORS = 2048
+EDGE_THRESHOLD = 32         # gray-level gradient counted as an edge
+SMOOTH_MAX = 8              # small non-zero gradients: shading, photo noise
+PHOTO_SMOOTHNESS = 0.5
+PARTIAL_ALPHA = 0.01        # share of semi-transparent pixels for "partial" alpha
+TOP_CANDIDATES = 3
+MIN_PSNR = 38.0             # lossy candidates must stay above this vs the source
+
+AVIF = features.check("avif")
+
+
+def content_stats(img) -> dict:
+    """Vectorized statistics used by classify()."""
+    arr = np.asarray(img.convert("RGBA"))
+    step = max(1, max(arr.shape[:2]) // STATS_MAX_SIDE)
+    arr = arr[::step, ::step]
+
+    rgb = arr[..., :3].astype(np.uint32)
+    packed = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+    alpha = arr[..., 3]
+    packed = packed[alpha > 0]
+
+    gray = arr[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    gradient = np.hypot(np.diff(gray, axis=1)[:-1], np.diff(gray, axis=0)[:, :-1])
+    flat = gradient <= EDGE_THRESHOLD
+
+    partial = ((alpha > 0) & (alpha < 255)).mean()
+    return {
+        "colors": int(len(np.unique(packed))),
+        "alpha": "none" if (alpha == 255).all() else "partial" if partial >= PARTIAL_ALPHA else "binary",
+        "edge_density": round(float(1 - flat.mean()), 4),
+        "smoothness": round(float(((gradient > 0) & flat & (gradient <= SMOOTH_MAX)).sum() / max(flat.sum(), 1)), 4),
+    }
+
+
+def classify(stats: dict):
+    """(kind, candidate formats best-first) for the statistics."""
+    alpha = stats["alpha"] != "none"
+
+    if stats["colors"] <= PALETTE_COLORS:
+        return "flat", ["png-palette", "webp-lossless"]
+    if stats["colors"] >= PHOTO_COLORS and stats["smoothness"] >= PHOTO_SMOOTHNESS:
+        lossy = ["webp", "avif"] if alpha else ["jpeg", "webp", "avif"]
+        return "photo", [f for f in lossy if f != "avif" or AVIF]
+    return "graphic", ["webp-lossless", "png-palette", "webp"]
+
+
+def current_format(path: Path) -> str:
+    return "png" if path.suffix.lower() == ".png" else "jpeg"
+
+
+def encode(img, fmt: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "png":
+        img.save(buffer, "PNG", optimize=True)
+    elif fmt == "png-palette":
+        method = Image.Quantize.FASTOCTREE if img.mode == "RGBA" else Image.Quantize.MEDIANCUT
+        img.quantize(PALETTE_COLORS, method=method).save(buffer, "PNG", optimize=True)
+    elif fmt == "jpeg":
+        img.convert("RGB").save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    elif fmt == "webp":
+        img.save(buffer, "WEBP", quality=quality)
+    elif fmt == "webp-lossless":
+        img.save(buffer, "WEBP", lossless=True)
+    elif fmt == "avif":
+        img.save(buffer, "AVIF", quality=quality)
+    return buffer.getvalue()
+
+
+def shown(img):
+    """What the browser paints: transparent pixels' RGB doesn't count."""
+    if img.mode != "RGBA":
+        return img.convert("RGB")
+    return Image.alpha_composite(Image.new("RGBA", img.size, (128, 128, 128, 255)), img).convert("RGB")
+
+
+def trial(img, fmt: str, quality: int) -> dict:
+    data = encode(img, fmt, quality)
+    with Image.open(io.BytesIO(data)) as decoded:
+        quality_db = psnr(shown(img), shown(decoded.convert(img.mode)))
+    return {"bytes": len(data), "psnr": None if quality_db == float("inf") else round(quality_db, 1)}
+
+
+def decide(path: Path) -> dict:
+    settings = get_settings(path.name)
+    img, _ = open_resized(path, max_width=settings["max_width"])
+    with img:
+        img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        stats = content_stats(img)
+        kind, candidates = classify(stats)
+
+        baseline = current_format(path)
+        formats = [baseline] + [f for f in candidates[:TOP_CANDIDATES] if f != baseline]
+        jobs = {f: (lambda im=img.copy(), f=f: trial(im, f, settings["quality"])) for f in formats}
+        results = {f: result for f, (result, _) in encode_all(jobs).items()}
+
+    acceptable = {f: r for f, r in results.items() if r["psnr"] is None or r["psnr"] >= MIN_PSNR}
+    best = min(acceptable, key=lambda f: acceptable[f]["bytes"]) if acceptable else baseline
+
+    return {
+        "kind": kind,
+        "stats": stats,
+        "format": best,
+        "bytes": results[best]["bytes"],
+        "psnr": results[best]["psnr"],
+        "current": {"format": baseline, "bytes": results[baseline]["bytes"]},
+        "saved": results[baseline]["bytes"] - results[best]["bytes"],
+        "candidates": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Choose the output format of each image from its content")
+    parser.add_argument("files", nargs="*", help="images to analyse (default: all in public/images)")
+    args = parser.parse_args()
+
+    if args.files:
+        paths = [Path(f) for f in args.files]
+    else:
+        paths = sorted(p for ext in ("*.png", "*.jpg", "*.jpeg") for p in IMAGES_DIR.glob(ext) if not is_hashed(p))
+
+    entries = {}
+    total_saved = 0
+
+    for path in paths:
+        if not path.exists():
+            print(f"[SKIP] {path.name}: not found")
+            continue
+
+        try:
+            decision = decide(path)
+        except Exception as e:
+            print(f"[ERR] {path.name}: {e}")
+            continue
+
+        entries[path.name] = decision
+        total_saved += decision["saved"]
+        stats = decision["stats"]
+        print(f"[OK] {path.name}: {decision['kind']} -> {decision['format']} "
+              f"({decision['current']['bytes']/1024:.0f}KB -> {decision['bytes']/1024:.0f}KB)")
+        print(f"     colors {stats['colors']}, alpha {stats['alpha']}, "
+              f"edges {stats['edge_density']:.1%}, smooth {stats['smoothness']:.1%}")
+
+    if entries:
+        update_section("formats", entries)
+        print(f"\nTotal saved: {total_saved/1024:.0f}KB, recorded in asset-manifest.json")
+
+
+if __name__ == "__main__":
+    main()
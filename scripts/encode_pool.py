@@ -0,0 +1,54 @@
+"""
+Bounded thread pool for running the output encodes of one decoded image
+concurrently (Pillow's encoders release the GIL).
+
+IMAGE_WORKERS (default: CPU count) is the global worker budget. A process
+pool of N workers calls configure(N) in each worker, so every process gets
+IMAGE_WORKERS // N encode threads and the machine isn't oversubscribed.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+WORKER_BUDGET = int(os.environ.get("IMAGE_WORKERS", os.cpu_count() or 1))
+
+_threads = WORKER_BUDGET
+_pool = None
+
+
+def configure(processes: int = 1) -> int:
+    """Split the worker budget across processes; returns threads for this one."""
+    global _threads, _pool
+    _threads = max(1, WORKER_BUDGET // max(1, processes))
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+    return _threads
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=_threads, thread_name_prefix="encode")
+    return _pool
+
+
+def _timed(job):
+    start = time.perf_counter()
+    result = job()
+    return result, time.perf_counter() - start
+
+
+def encode_all(jobs: dict) -> dict:
+    """
+    Run {name: callable} concurrently and return {name: (result, seconds)}.
+    Jobs must not share a PIL Image: save() stores per-call state on it, so
+    give each job its own copy.
+    """
+    if len(jobs) == 1 or _threads == 1:
+        return {name: _timed(job) for name, job in jobs.items()}
+
+    pool = _get_pool()
+    futures = {name: pool.submit(_timed, job) for name, job in jobs.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Extract the smallest seamless tile from a repeating pattern image.
+Finds the repeat period on both axes from the FFT autocorrelation, averages
+all full periods into one tile, checks the re-tiled result against the
+original and records the tile with its CSS usage in asset-manifest.json.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from asset_manifest import update_section
+from staged_output import StagedRun
+
+IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
+
+# Output of generate-decorations.py meant to be tileable
+PATTERNS = ["pattern-grid.png"]
+
+MIN_PERIOD = 4
+MIN_CORRELATION = 0.5  # autocorrelation peak, relative to lag 0
+TOLERANCE = 6.0        # mean abs error (0-255) of the re-tiled image
+
+
+def autocorrelation(gray):
+    """Normalised circular 2D autocorrelation of a mean-subtracted image."""
+    signal = gray - gray.mean()
+    spectrum = np.fft.rfft2(signal)
+    ac = np.fft.irfft2(spectrum * np.conj(spectrum), s=gray.shape)
+    return ac / ac[0, 0] if ac[0, 0] > 0 else ac
+
+
+def period_candidates(profile, length):
+    """Lags that are local autocorrelation maxima above MIN_CORRELATION, shortest first."""
+    lags = np.arange(MIN_PERIOD, length // 2 + 1)
+    if len(lags) == 0:
+        return []
+    values = profile[lags]
+    before, after = profile[lags - 1], profile[(lags + 1) % length]
+    peaks = lags[(values >= MIN_CORRELATION) & (values >= before) & (values >= after)]
+    return [int(p) for p in peaks]
+
+
+def build_tile(pixels, px, py):
+    """Average every full period into one tile (removes generation noise)."""
+    ny, nx = pixels.shape[0] // py, pixels.shape[1] // px
+    periods = pixels[:ny * py, :nx * px].reshape(ny, py, nx, px, -1)
+    return periods.mean(axis=(0, 2))
+
+
+def retile_error(pixels, tile):
+    h, w = pixels.shape[:2]
+    py, px = tile.shape[:2]
+    tiled = np.tile(tile, (h // py + 1, w // px + 1, 1))[:h, :w]
+    return float(np.abs(tiled - pixels).mean())
+
+
+def find_tile(pixels, tolerance):
+    """Smallest (px, py, tile, error) that re-tiles within tolerance, or None."""
+    h, w = pixels.shape[:2]
+    gray = pixels[:, :, :3].mean(axis=2)
+    ac = autocorrelation(gray)
+
+    xs = period_candidates(ac[0], w) + [w]
+    ys = period_candidates(ac[:, 0], h) + [h]
+
+    # Smallest tile area first
+    for px, py in sorted(((x, y) for x in xs for y in ys), key=lambda p: p[0] * p[1]):
+        if (px, py) == (w, h):
+            break
+        tile = build_tile(pixels, px, py)
+        error = retile_error(pixels, tile)
+        if error <= tolerance:
+            return px, py, tile, error
+    return None
+
+
+def extract(path: Path, tolerance: float, run: StagedRun) -> dict:
+    """Find the tile of path and stage it through run (swapped in when the run commits)."""
+    with run.read(path), Image.open(path) as img:
+        mode = "RGBA" if "A" in img.getbands() else "RGB"
+        pixels = np.asarray(img.convert(mode), dtype=np.float32)
+        original_bytes = path.stat().st_size
+
+    found = find_tile(pixels, tolerance)
+    if found is None:
+        return None
+
+    px, py, tile, error = found
+    tile_path = path.with_name(f"{path.stem}-tile.png")
+    staged = run.stage(tile_path, source=path)
+    Image.fromarray(np.clip(np.round(tile), 0, 255).astype(np.uint8), mode).save(staged, "PNG", optimize=True)
+
+    url = "/" + tile_path.relative_to(IMAGES_DIR.parent).as_posix()
+    return {
+        "tile": url,
+        "period": [px, py],
+        "error": round(error, 2),
+        "original_bytes": original_bytes,
+        "tile_bytes": staged.stat().st_size,
+        "css": f"background-image: url({url}); background-repeat: repeat; background-size: {px}px {py}px;",
+        "usage": "background-size keeps the original scale; multiply both values to render the pattern "
+                 "larger or smaller.",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the minimal repeating tile of a pattern image")
+    parser.add_argument("files", nargs="*", help=f"images to analyse (default: {', '.join(PATTERNS)})")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="max mean abs error (0-255) between the re-tiled and the original image")
+    args = parser.parse_args()
+
+    paths = [Path(f) for f in args.files] or [IMAGES_DIR / name for name in PATTERNS]
+    entries = {}
+
+    # Tiles are swapped into public/images together at the end of the run
+    with StagedRun("extract-tile") as run:
+        for path in paths:
+            if not path.exists():
+                print(f"[SKIP] {path.name}: not found")
+                continue
+
+            record = extract(path, args.tolerance, run)
+            if record is None:
+                print(f"[SKIP] {path.name}: no repeat within tolerance {args.tolerance}")
+                continue
+
+            entries[path.name] = record
+            px, py = record["period"]
+            print(f"[OK] {path.name}: {px}x{py}px tile, error {record['error']}, "
+                  f"{record['original_bytes']/1024:.0f}KB -> {record['tile_bytes']/1024:.1f}KB")
+
+    # A tile dropped because its source changed meanwhile isn't on disk
+    for source in run.conflicts:
+        entries.pop(source.name, None)
+
+    if entries:
+        update_section("tiles", entries)
+        print("\nRecorded in asset-manifest.json")
+
+
+if __name__ == "__main__":
+    main()
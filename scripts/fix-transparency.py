@@ -1,114 +1,306 @@
 #!/usr/bin/env python3
 """
 Fix PNG images that have checkered background pattern instead of true transparency.
-Finds dominant background colors in corners and removes them.
+Detects a two-tone checker background on the image edges and removes the part of it
+that lies on the checker lattice and is connected to the border (or fills a two-tone
+hole in the artwork), so matching colours inside the artwork survive. A plain neutral
+edge colour is only removed with --solid.
+
+--sweep tries a grid of tolerances without touching public/images: the per-pixel
+distance map is cached as .npy and memory-mapped, each tolerance thresholds it and
+repeats the flood fill. It reports holes (cleared areas not connected to the border)
+and kept background colours. Apply the chosen value with --tolerance.
 """
 
+import argparse
+import hashlib
+import math
+import time
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageDraw
 import numpy as np
-from collections import Counter
 
-IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
-
-def get_dominant_colors_from_edges(img_array, edge_size=20):
-    """Get the two most common colors from image edges (likely background)."""
-    h, w = img_array.shape[:2]
-
-    edge_pixels = []
-
-    # Top edge
-    for y in range(min(edge_size, h)):
-        for x in range(w):
-            edge_pixels.append(tuple(img_array[y, x, :3]))
-
-    # Bottom edge
-    for y in range(max(0, h - edge_size), h):
-        for x in range(w):
-            edge_pixels.append(tuple(img_array[y, x, :3]))
+from asset_hash import content_hash, is_hashed
+from staged_output import StagedRun
 
-    # Left edge
-    for y in range(h):
-        for x in range(min(edge_size, w)):
-            edge_pixels.append(tuple(img_array[y, x, :3]))
-
-    # Right edge
-    for y in range(h):
-        for x in range(max(0, w - edge_size), w):
-            edge_pixels.append(tuple(img_array[y, x, :3]))
-
-    if not edge_pixels:
+IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
+SWEEP_DIR = Path(__file__).parent.parent / ".cache" / "transparency"
+
+TOLERANCE = 45
+SWEEP_TOLERANCES = [15, 30, 45, 60, 75, 90]
+PREVIEW_SIZE = 192          # contact sheet cell
+
+# Checkerboard detection runs on a downsampled edge band
+DETECT_MAX_SIDE = 512
+DETECT_BAND = 16            # band depth in downsampled pixels
+MIN_CELL, MAX_CELL = 4, 64  # checker cell size in source pixels
+MIN_PERIODICITY = 0.35      # share of the band's AC power at the checker period
+MIN_CONTRAST = 6            # gray levels between the two checker tones
+TONE_TOLERANCE = 10         # gray levels a pixel may be off its tone
+MIN_TONE_SHARE = 0.8        # share of band pixels that must sit on a tone
+
+# Removal keeps to the checker lattice, phased from tone flips on the border band
+MIN_FLIPS = 16              # flips needed per axis to place the lattice
+MAX_FLIPS = 20000           # flips sampled per axis for the fit
+MIN_LATTICE_FIT = 0.5       # resultant length of the flip phases (1 = perfect grid)
+LATTICE_SLACK = 1           # px each side of a cell boundary where either tone is fine
+MIN_CHECKER_SHARE = 0.1     # each tone's share of the 2x2-cell window around a cleared pixel
+MIN_HOLE_SHARE = 0.25       # the same, to seed an enclosed hole in the artwork
+SOLID_TOLERANCE = 15        # cap for plain backgrounds: a white card on an off-white page is ~20 away
+
+def is_neutral(c):
+    r, g, b = c
+    return abs(r - g) < 30 and abs(g - b) < 30 and abs(r - b) < 30
+
+def band_periodicity(band):
+    """
+    Strength and period of the dominant repeat along axis 1 of a gray band.
+    Power spectra are summed per row, so the alternating phase of checker rows doesn't cancel out.
+    """
+    signal = band - band.mean(axis=1, keepdims=True)
+    power = (np.abs(np.fft.rfft(signal, axis=1)) ** 2).sum(axis=0)
+    power[0] = 0
+    total = power.sum()
+    if total == 0:
+        return 0.0, None
+
+    k = int(np.argmax(power))
+    # Non-integer periods leak into the neighbouring bins
+    peak = power[max(k - 1, 1):k + 2].sum()
+    return float(peak / total), band.shape[1] / k
+
+def detect_checkerboard(img, allow_solid=False):
+    """
+    Look for a fake transparency background on the image edges.
+
+    Returns None for photos and images that already have real alpha, otherwise
+    {"kind": "checker" | "solid", "cell": px or None, "colors": (rgb, ...), "periodicity": float}.
+    A single neutral edge colour ("solid") is just as likely a white card or
+    page, so it is only reported with allow_solid.
+    """
+    factor = max(1, math.ceil(max(img.size) / DETECT_MAX_SIDE))
+    small = img if img.mode in ('RGB', 'RGBA') else img.convert('RGBA')
+    if factor > 1:
+        small = small.reduce(factor)
+    arr = np.asarray(small.convert('RGBA'))
+    h, w = arr.shape[:2]
+    depth = min(DETECT_BAND, h // 4, w // 4)
+    if depth < 1:
         return None
 
-    # Round colors to reduce noise (group similar colors)
-    def round_color(c, step=8):
-        return tuple(round(v / step) * step for v in c)
-
-    rounded = [round_color(p) for p in edge_pixels]
-    counter = Counter(rounded)
-
-    # Get top 2 most common colors
-    most_common = counter.most_common(10)
+    rows = np.concatenate([arr[:depth], arr[h - depth:]])                       # (2d, w, 4)
+    cols = np.concatenate([arr[:, :depth], arr[:, w - depth:]], axis=1).transpose(1, 0, 2)  # (2d, h, 4)
+    band = np.concatenate([rows.reshape(-1, 4), cols.reshape(-1, 4)])
 
-    # Filter for grayish colors only (background checker is always neutral)
-    def is_neutral(c):
-        r, g, b = c
-        return abs(r - g) < 30 and abs(g - b) < 30 and abs(r - b) < 30
-
-    neutral_colors = [(c, count) for c, count in most_common if is_neutral(c)]
+    # Edges already transparent: nothing to fix
+    if (band[:, 3] == 0).mean() >= 0.5:
+        return None
 
-    if len(neutral_colors) >= 2:
-        # Return the two most common neutral colors
-        return (neutral_colors[0][0], neutral_colors[1][0])
-    elif len(neutral_colors) == 1:
-        # Only one neutral color - might be solid background
-        return (neutral_colors[0][0],)
+    gray_of = lambda a: a[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    gray = gray_of(band)
 
-    return None
+    # Two-tone fit: split halfway between the dark and light ends of the band
+    lo_end, hi_end = np.percentile(gray, [5, 95])
+    split = (lo_end + hi_end) / 2
+    dark, light = gray <= split, gray > split
+    tones = [gray[m].mean() for m in (light, dark) if m.any()]
 
-def remove_background_colors(img_array, bg_colors, tolerance=45):
-    """Remove pixels matching background colors."""
-    h, w = img_array.shape[:2]
+    on_tone = np.zeros(len(gray), dtype=bool)
+    for tone in tones:
+        on_tone |= np.abs(gray - tone) <= TONE_TOLERANCE
+    if on_tone.mean() < MIN_TONE_SHARE:
+        return None  # busy edges: photo or illustration
 
-    modified_count = 0
+    colors = tuple(tuple(int(v) for v in np.median(band[m, :3], axis=0)) for m in (light, dark) if m.any())
+    if not all(is_neutral(c) for c in colors):
+        return None
 
-    for y in range(h):
-        for x in range(w):
-            pixel_rgb = tuple(img_array[y, x, :3])
-            current_alpha = img_array[y, x, 3]
+    if len(tones) == 1 or tones[0] - tones[1] < MIN_CONTRAST:
+        if not allow_solid:
+            return None
+        return {"kind": "solid", "cell": None, "colors": colors[:1], "periodicity": 0.0}
 
-            if current_alpha == 0:
-                continue
+    strength, period = max(band_periodicity(gray_of(rows)), band_periodicity(gray_of(cols)),
+                           key=lambda r: r[0])
+    cell = round(period * factor / 2) if period else None
+    if strength < MIN_PERIODICITY or cell is None or not MIN_CELL <= cell <= MAX_CELL:
+        return None
 
-            for bg_color in bg_colors:
-                dist = sum(abs(int(a) - int(b)) for a, b in zip(pixel_rgb, bg_color))
-                if dist < tolerance:
-                    img_array[y, x, 3] = 0
-                    modified_count += 1
-                    break
+    return {"kind": "checker", "cell": cell, "colors": colors, "periodicity": round(strength, 2)}
+
+def background_distance(img_array, bg_colors):
+    """
+    Per-pixel L1 RGB distance to the nearest background color (uint16).
+    Already transparent pixels get the max value so no tolerance selects them.
+    """
+    rgb = img_array[:, :, :3].astype(np.int16)
+    dist = np.full(rgb.shape[:2], np.iinfo(np.uint16).max, dtype=np.uint16)
+    for bg_color in bg_colors:
+        np.minimum(dist, np.abs(rgb - np.array(bg_color, dtype=np.int16)).sum(axis=2, dtype=np.uint16), out=dist)
+
+    dist[img_array[:, :, 3] == 0] = np.iinfo(np.uint16).max
+    return dist
+
+def _flood_runs(mask, reached):
+    """Mark every horizontal run of mask that contains a reached pixel."""
+    h, w = mask.shape
+    flat = mask.ravel()
+    starts = flat.copy()
+    starts[1:] &= ~flat[:-1]
+    starts[::w] = flat[::w]
+    run = np.cumsum(starts, dtype=np.int32) - 1
+    hit = np.zeros(int(run[-1]) + 2, dtype=bool)
+    hit[run[flat & reached.ravel()]] = True
+    out = np.zeros_like(flat)
+    out[flat] = hit[run[flat]]
+    return out.reshape(h, w)
+
+def border_connected(mask, seeds=None):
+    """Pixels of mask 4-connected to the image border, or to seeds (flood fill)."""
+    reached = mask & seeds if seeds is not None else np.zeros_like(mask)
+    reached[[0, -1]] |= mask[[0, -1]]
+    reached[:, [0, -1]] |= mask[:, [0, -1]]
+
+    # Each pass floods whole row/column runs, so a few passes reach everything
+    count = -1
+    while count != (count := int(reached.sum())):
+        reached = _flood_runs(mask, reached)
+        reached = _flood_runs(mask.T, reached.T).T
+    return reached
+
+def dark_tone(img_array, bg_colors):
+    """True where a pixel is nearer the dark checker colour (both are neutral, so by brightness)."""
+    split = sum(bg_colors[0]) + sum(bg_colors[1])
+    return img_array[:, :, :3].sum(axis=2, dtype=np.uint16) * 2 < split
+
+def _box_sum(mask, size):
+    """Count of mask pixels in the size x size window around each pixel."""
+    before, after = size // 2, size - size // 2
+    pad = (before + 1, after - 1)  # plus a leading zero row/column
+    table = np.pad(np.asarray(mask, dtype=np.int32), (pad, pad)).cumsum(0).cumsum(1)
+    return table[size:, size:] - table[:-size, size:] - table[size:, :-size] + table[:-size, :-size]
+
+def tone_balance(matches, tone, cell):
+    """
+    Share of the 2x2-cell window around each pixel held by the rarer checker
+    tone among matches. Light or gray detail in the artwork has only one tone,
+    so it scores 0 further than a cell from real checker.
+    """
+    size = 2 * cell
+    before, after = size // 2, size - size // 2
+    dark = _box_sum(matches & tone, size)
+    least = np.minimum(dark, _box_sum(matches, size) - dark)
+    # Windows are clipped at the image edge
+    span = lambda n: np.minimum(np.arange(n) + after, n) - np.maximum(np.arange(n) - before, 0)
+    return least / np.outer(span(matches.shape[0]), span(matches.shape[1])).astype(np.float32)
+
+def _lattice_axis(positions, cell):
+    """(period, offset, fit) of the lattice lines best matching tone flip positions."""
+    periods = np.arange(max(cell - 1, 2), cell + 1.001, 0.05)
+    phases = np.exp(2j * np.pi * positions[None, :] / periods[:, None]).mean(axis=1)
+    best = int(np.argmax(np.abs(phases)))
+    period = float(periods[best])
+    offset = (np.angle(phases[best]) / (2 * np.pi) * period) % period
+    return period, offset, float(np.abs(phases[best]))
+
+def checker_lattice(tone, cell, matches):
+    """
+    Pixels whose tone is the one the checker lattice puts at their position.
+
+    The detected cell is refined and phased from tone flips between background
+    pixels on the border band; next to cell boundaries either tone is accepted.
+    Returns None when the band doesn't pin the lattice down.
+    """
+    h, w = tone.shape
+
+    depth = min(2 * cell, h // 4, w // 4)
+    band = np.zeros((h, w), dtype=bool)
+    band[:depth] = band[h - depth:] = True
+    band[:, :depth] = band[:, w - depth:] = True
+    background = matches & band
+
+    axes = []
+    for t, b in ((tone, background), (tone.T, background.T)):
+        flips = (t[:, 1:] != t[:, :-1]) & b[:, 1:] & b[:, :-1]
+        positions = np.nonzero(flips)[1] + 1  # first pixel of the next cell
+        if len(positions) < MIN_FLIPS:
+            return None
+        positions = positions[::max(1, len(positions) // MAX_FLIPS)].astype(np.float64)
+        axes.append(_lattice_axis(positions, cell))
+
+    (px, ox, fit_x), (py, oy, fit_y) = axes
+    if min(fit_x, fit_y) < MIN_LATTICE_FIT:
+        return None
 
-    return modified_count
+    u = (np.arange(w) - ox) / px
+    v = (np.arange(h) - oy) / py
+    parity = lambda f: np.floor(f).astype(np.int64) % 2 == 1
+    expected = parity(v)[:, None] ^ parity(u)[None, :]
+    if (expected == tone)[background].mean() < 0.5:
+        expected = ~expected  # the other tone sits on even cells
+
+    near = lambda f, period: np.minimum(f % 1, 1 - f % 1) * period <= LATTICE_SLACK
+    slack = near(v, py)[:, None] | near(u, px)[None, :]
+    return (tone == expected) | slack
+
+def background_mask(img_array, detection, tolerance=TOLERANCE, dist=None, lattice=None, holes=True):
+    """
+    Fake-background pixels: close to a background colour, on the checker
+    lattice when there is one, and connected to the image border or (with
+    holes) to a two-tone checkered hole, so the same colours inside the
+    artwork are kept. On a checker the flood only crosses pixels with both
+    tones around them.
+    """
+    if dist is None:
+        dist = background_distance(img_array, detection["colors"])
+    if not detection.get("cell"):
+        return border_connected(np.asarray(dist) < min(tolerance, SOLID_TOLERANCE))
+
+    matches = np.asarray(dist) < tolerance
+
+    tone = dark_tone(img_array, detection["colors"])
+    if lattice is None:
+        lattice = checker_lattice(tone, detection["cell"], matches)
+    if lattice is not None:
+        matches &= lattice
+    balance = tone_balance(matches, tone, detection["cell"])
+    seeds = matches & (balance >= MIN_HOLE_SHARE) if holes else None
+    return border_connected(matches & (balance >= MIN_CHECKER_SHARE), seeds)
+
+def remove_background(img_array, detection, tolerance=TOLERANCE):
+    """Make the fake background transparent in place; returns the pixel count."""
+    mask = background_mask(img_array, detection, tolerance)
+    img_array[:, :, 3][mask] = 0
+    return int(mask.sum())
+
+def fix_transparency(filepath, detection=None, tolerance=TOLERANCE, run=None, quick=False):
+    """
+    Fix checkered background in a PNG image (written through run, or its own run).
+    quick skips the PNG optimize pass; optimize-images re-encodes the file anyway.
+    Returns 0 when nothing was written, including an own run's dropped output.
+    """
+    if run is None:
+        with StagedRun("fix-transparency") as run:
+            pixels_changed = fix_transparency(filepath, detection, tolerance, run, quick)
+        return 0 if filepath in run.conflicts else pixels_changed
 
-def fix_transparency(filepath):
-    """Fix checkered background in a PNG image."""
     try:
-        with Image.open(filepath) as img:
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
+        with run.read(filepath), Image.open(filepath) as img:
+            if detection is None:
+                detection = detect_checkerboard(img)
+            if not detection:
+                return 0
 
-            img_array = np.array(img)
+            img_array = np.array(img.convert('RGBA'))
 
-            # Get dominant background colors from edges
-            bg_colors = get_dominant_colors_from_edges(img_array)
+            # Background colors and checker cell come from the detector
+            print(f"  Background colors: {detection['colors']}")
+            pixels_changed = remove_background(img_array, detection, tolerance)
 
-            if bg_colors:
-                print(f"  Background colors: {bg_colors}")
-                pixels_changed = remove_background_colors(img_array, bg_colors)
-
-                if pixels_changed > 0:
-                    result = Image.fromarray(img_array, 'RGBA')
-                    result.save(filepath, 'PNG', optimize=True)
-                    return pixels_changed
+            if pixels_changed > 0:
+                result = Image.fromarray(img_array, 'RGBA')
+                result.save(run.stage(filepath), 'PNG', optimize=not quick)
+                return pixels_changed
 
             return 0
 
@@ -116,39 +308,184 @@ def fix_transparency(filepath):
         print(f"  Error: {e}")
         import traceback
         traceback.print_exc()
+        run.drop(filepath)
         return 0
 
+def cached_distance(filepath, img_array, bg_colors):
+    """Distance map from the .npy cache (memory-mapped), computed on first use."""
+    colors_key = hashlib.sha256(repr(bg_colors).encode()).hexdigest()[:8]
+    cache = SWEEP_DIR / f"{filepath.stem}.{content_hash(filepath)}.{colors_key}.npy"
+
+    if not cache.exists():
+        SWEEP_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in SWEEP_DIR.glob(f"{filepath.stem}.*.npy"):
+            stale.unlink()
+        tmp = cache.with_suffix(".tmp.npy")
+        np.save(tmp, background_distance(img_array, bg_colors))
+        tmp.replace(cache)
+
+    return np.load(cache, mmap_mode="r")
+
+def checker(size, cell=8):
+    """Real checkerboard to preview transparency on."""
+    w, h = size
+    ys, xs = np.indices((h, w)) // cell
+    tone = np.where((xs + ys) % 2, 204, 255).astype(np.uint8)
+    return Image.fromarray(np.dstack([tone] * 3), 'RGB')
+
+def sweep_image(filepath, detection, tolerances):
+    """Evaluate every tolerance on one image; returns (stats, preview cells)."""
+    with Image.open(filepath) as img:
+        img_array = np.array(img.convert('RGBA'))
+
+    dist = cached_distance(filepath, img_array, detection["colors"])
+    h, w = dist.shape
+    total = h * w
+
+    # The lattice only depends on the border band, place it once per image
+    lattice = None
+    if detection.get("cell"):
+        tone = dark_tone(img_array, detection["colors"])
+        lattice = checker_lattice(tone, detection["cell"], np.asarray(dist) < TOLERANCE)
+    on_lattice = lattice if lattice is not None else True
+
+    # Nearest-neighbour preview grid shared by every tolerance
+    scale = PREVIEW_SIZE / max(h, w)
+    ys = np.linspace(0, h - 1, max(1, round(h * scale))).astype(int)
+    xs = np.linspace(0, w - 1, max(1, round(w * scale))).astype(int)
+    small_rgba = img_array[ys][:, xs]
+
+    stats, cells = [], []
+    for tolerance in tolerances:
+        removed = background_mask(img_array, detection, tolerance, dist, lattice)
+        # Cleared areas the border flood doesn't reach: holes in the foreground
+        holes = removed & ~background_mask(img_array, detection, tolerance, dist, lattice, holes=False)
+        # Background-coloured pixels the flood doesn't reach: artwork detail (or a missed hole)
+        kept = (np.asarray(dist) < tolerance) & on_lattice & ~removed
+        stats.append({"tolerance": tolerance, "removed": removed.sum() / total,
+                      "holes": holes.sum() / total, "kept": kept.sum() / total})
+
+        preview = small_rgba.copy()
+        preview[removed[ys][:, xs], 3] = 0
+        preview[holes[ys][:, xs]] = (0, 0, 255, 160)
+        preview[kept[ys][:, xs]] = (255, 0, 0, 160)
+        cell = checker((len(xs), len(ys)))
+        cell.paste(Image.fromarray(preview, 'RGBA'), (0, 0), Image.fromarray(preview, 'RGBA'))
+        cells.append(cell)
+
+    return stats, cells
+
+def contact_sheet(rows, tolerances):
+    """One row per image, one column per tolerance, holes tinted blue, kept background colours red."""
+    label_h = 14
+    cell = PREVIEW_SIZE + 4
+    sheet = Image.new('RGB', (cell * len(tolerances), (cell + label_h) * len(rows) + label_h), 'white')
+    draw = ImageDraw.Draw(sheet)
+
+    for col, tolerance in enumerate(tolerances):
+        draw.text((col * cell + 2, 1), f"tolerance {tolerance}", fill='black')
+    for row, (name, cells) in enumerate(rows):
+        top = label_h + row * (cell + label_h)
+        draw.text((2, top + 1), name, fill='black')
+        for col, preview in enumerate(cells):
+            sheet.paste(preview, (col * cell + 2, top + label_h))
+
+    path = SWEEP_DIR / "sweep.png"
+    sheet.save(path)
+    return path
+
+def sweep(png_files, tolerances, allow_solid=False):
+    """Print removed/holes/kept per tolerance and write a contact sheet; never writes public/images."""
+    rows = []
+    for filepath in sorted(png_files):
+        with Image.open(filepath) as img:
+            detection = detect_checkerboard(img, allow_solid)
+        if not detection:
+            print(f"Skipping: {filepath.name} (no fake background)")
+            continue
+
+        start = time.perf_counter()
+        stats, cells = sweep_image(filepath, detection, tolerances)
+        elapsed = (time.perf_counter() - start) * 1000
+        rows.append((filepath.name, cells))
+
+        print(f"{filepath.name} ({detection['kind']}, {elapsed:.0f}ms)")
+        for s in stats:
+            print(f"  tolerance {s['tolerance']:>3}: removed {s['removed']:6.1%}  holes {s['holes']:6.2%}  kept {s['kept']:6.2%}")
+
+    if not rows:
+        print("No PNG files with a fake background.")
+        return
+
+    print(f"\nContact sheet: {contact_sheet(rows, tolerances)}")
+    print("Apply with: fix-transparency.py --tolerance N")
+
+def tolerance_list(value):
+    """argparse type for --tolerances: sorted ints >= 1 (0 would clear nothing)."""
+    try:
+        tolerances = sorted({int(t) for t in value.split(",")})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a comma-separated list of integers: {value!r}")
+    if tolerances[0] < 1:
+        raise argparse.ArgumentTypeError("tolerances must be at least 1")
+    return tolerances
+
 def main():
     """Process all PNG images in the public/images directory."""
-    print(f"Scanning: {IMAGES_DIR}\n")
+    parser = argparse.ArgumentParser(description="Replace fake checkerboard backgrounds with real transparency")
+    parser.add_argument("--tolerance", type=int, default=TOLERANCE,
+                        help=f"max RGB distance to a background color (default: {TOLERANCE})")
+    parser.add_argument("--sweep", action="store_true",
+                        help="preview a grid of tolerances without modifying any image")
+    parser.add_argument("--tolerances", type=tolerance_list, default=",".join(map(str, SWEEP_TOLERANCES)),
+                        help="comma-separated tolerances (>= 1) for --sweep")
+    parser.add_argument("--solid", action="store_true",
+                        help="also clear plain neutral edge backgrounds (border-connected only)")
+    args = parser.parse_args()
 
-    # Skip photo images
-    skip_patterns = ['case-', 'service-', 'hero-', 'benefits-', 'mozart-hero']
+    print(f"Scanning: {IMAGES_DIR}\n")
 
-    png_files = list(IMAGES_DIR.glob("*.png"))
+    # Hashed copies are immutable, only their source gets fixed
+    png_files = [f for f in IMAGES_DIR.glob("*.png") if not is_hashed(f)]
 
     if not png_files:
         print("No PNG files found.")
         return
 
+    if args.sweep:
+        sweep(png_files, args.tolerances, args.solid)
+        return
+
     fixed_count = 0
     skipped_count = 0
 
-    for filepath in sorted(png_files):
-        if any(pattern in filepath.name for pattern in skip_patterns):
-            print(f"Skipping photo: {filepath.name}")
-            skipped_count += 1
-            continue
+    # Fixed files are swapped into public/images together at the end of the run
+    with StagedRun("fix-transparency") as run:
+        for filepath in sorted(png_files):
+            start = time.perf_counter()
+            with Image.open(filepath) as img:
+                detection = detect_checkerboard(img, args.solid)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            if not detection:
+                print(f"Skipping: {filepath.name} (no fake background, {elapsed:.0f}ms)")
+                skipped_count += 1
+                continue
+
+            cell = f", cell {detection['cell']}px" if detection["cell"] else ""
+            print(f"Processing: {filepath.name} ({detection['kind']}{cell}, {elapsed:.0f}ms)")
 
-        print(f"Processing: {filepath.name}")
+            pixels_fixed = fix_transparency(filepath, detection, args.tolerance, run)
+            if pixels_fixed > 0:
+                print(f"  [FIXED] Made {pixels_fixed} pixels transparent")
+                fixed_count += 1
+            else:
+                print(f"  [SKIP] No background detected")
+                skipped_count += 1
 
-        pixels_fixed = fix_transparency(filepath)
-        if pixels_fixed > 0:
-            print(f"  [FIXED] Made {pixels_fixed} pixels transparent")
-            fixed_count += 1
-        else:
-            print(f"  [SKIP] No background detected")
-            skipped_count += 1
+    # Outputs dropped at commit because the file changed meanwhile weren't fixed
+    fixed_count -= len(run.conflicts)
+    skipped_count += len(run.conflicts)
 
     print(f"\n{'='*50}")
     print(f"Done! Fixed: {fixed_count}, Skipped: {skipped_count}")
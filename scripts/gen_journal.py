@@ -0,0 +1,107 @@
+"""
+Append-only JSONL journal for the generator scripts.
+Every attempt is recorded as "started" before the paid API call and as
+"ok"/"failed" afterwards, each line fsynced, so an interrupted run can
+resume with only the assets that still need work.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+JOURNAL_DIR = Path(__file__).parent.parent / ".journal"
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(" ".join(prompt.split()).encode("utf-8")).hexdigest()[:16]
+
+
+class Journal:
+    """Per-script journal; the latest record for each asset wins on replay."""
+
+    def __init__(self, name: str):
+        self.path = JOURNAL_DIR / f"{name}.jsonl"
+        self.state = {}
+        self.attempts = {}
+        self._torn = False
+        self._replay()
+
+    def _replay(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                self._torn = not line.endswith("\n")
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from a killed process
+                self.state[record["asset"]] = record
+                self.attempts[record["asset"]] = record.get("attempt", 0)
+
+    def _append(self, record: dict):
+        new_file = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One write per line on an O_APPEND fd, fsynced before we move on
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # Terminate a torn line first so it can't swallow this record
+            prefix = "\n" if self._torn else ""
+            os.write(fd, (prefix + json.dumps(record) + "\n").encode("utf-8"))
+            self._torn = False
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        if new_file:
+            dir_fd = os.open(self.path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+        self.state[record["asset"]] = record
+
+    def needs_work(self, asset: str, prompt: str, output: Path, retry_failed: bool = False) -> bool:
+        """
+        True unless the asset already succeeded with this prompt and its output
+        still exists. Failed assets are only retried with retry_failed.
+        """
+        record = self.state.get(asset)
+        if record is None or record["status"] == "started":
+            return True  # never run, or interrupted mid-call
+        if record["status"] == "failed":
+            return retry_failed
+        return record.get("prompt") != prompt_hash(prompt) or not output.exists()
+
+    def start(self, asset: str, prompt: str) -> float:
+        self.attempts[asset] = self.attempts.get(asset, 0) + 1
+        self._append({
+            "asset": asset, "status": "started", "attempt": self.attempts[asset],
+            "prompt": prompt_hash(prompt), "time": time.time(),
+        })
+        return time.perf_counter()
+
+    def finish(self, asset: str, prompt: str, started: float, output: Path = None, error: str = None):
+        ok = error is None and output is not None and output.exists()
+        self._append({
+            "asset": asset, "status": "ok" if ok else "failed", "attempt": self.attempts.get(asset, 1),
+            "prompt": prompt_hash(prompt), "time": time.time(),
+            "latency": round(time.perf_counter() - started, 2),
+            "hash": file_hash(output) if ok else None,
+            "error": error if not ok else None,
+        })
+        return ok
+
+    def summary(self):
+        counts = {}
+        for record in self.state.values():
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+        return counts
@@ -0,0 +1,91 @@
+"""
+Draft / final quality tiers for the generator scripts.
+Drafts use a cheaper model at its default size and go to a staging folder
+(.drafts/<script>/) with a contact sheet; approving a draft records its
+prompt hash, and promote re-runs only approved prompts at final quality.
+"""
+
+import json
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from gen_journal import Journal, prompt_hash
+
+DRAFTS_DIR = Path(__file__).parent.parent / ".drafts"
+DRAFT_MODEL = "gemini-2.5-flash-image"
+DRAFT_IMAGE_SIZE = None  # flash image has a single (~1K) size
+
+THUMB_SIZE = 256
+SHEET_COLUMNS = 4
+
+
+class Staging:
+    """Draft folder, draft journal and approvals of one generator script."""
+
+    def __init__(self, name: str):
+        self.dir = DRAFTS_DIR / name
+        self.journal = Journal(f"{name}-draft")
+        self.approvals_file = self.dir / "approved.json"
+
+    def path(self, filename: str) -> Path:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        return self.dir / filename
+
+    def approvals(self) -> dict:
+        if not self.approvals_file.exists():
+            return {}
+        return json.loads(self.approvals_file.read_text(encoding="utf-8"))
+
+    def _save(self, approvals: dict):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.approvals_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(approvals, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.approvals_file)
+
+    def approve(self, assets: list) -> list:
+        """Approve the latest successful draft of each asset; returns the ones without one."""
+        approvals = self.approvals()
+        missing = []
+        for asset in assets:
+            record = self.journal.state.get(asset)
+            if record is None or record["status"] != "ok" or not (self.dir / asset).exists():
+                missing.append(asset)
+                continue
+            approvals[asset] = record["prompt"]
+        self._save(approvals)
+        return missing
+
+    def is_approved(self, asset: str, prompt: str) -> bool:
+        """Approved, and the prompt hasn't been edited since the approved draft."""
+        return self.approvals().get(asset) == prompt_hash(prompt)
+
+    def promoted(self, asset: str):
+        approvals = self.approvals()
+        if approvals.pop(asset, None) is not None:
+            self._save(approvals)
+
+    def contact_sheet(self, filenames: list) -> Path:
+        """Labelled thumbnails of the drafts that exist, approved ones marked."""
+        drafts = [name for name in filenames if (self.dir / name).exists()]
+        if not drafts:
+            return None
+
+        approvals = self.approvals()
+        label_h = 16
+        cell_w, cell_h = THUMB_SIZE + 8, THUMB_SIZE + label_h + 8
+        rows = (len(drafts) + SHEET_COLUMNS - 1) // SHEET_COLUMNS
+        sheet = Image.new("RGB", (cell_w * min(len(drafts), SHEET_COLUMNS), cell_h * rows), "white")
+        draw = ImageDraw.Draw(sheet)
+
+        for i, name in enumerate(drafts):
+            x, y = (i % SHEET_COLUMNS) * cell_w + 4, (i // SHEET_COLUMNS) * cell_h + 4
+            with Image.open(self.dir / name) as img:
+                img.thumbnail((THUMB_SIZE, THUMB_SIZE))
+                sheet.paste(img.convert("RGB"), (x, y))
+            mark = " [approved]" if name in approvals else ""
+            draw.text((x, y + THUMB_SIZE + 2), name + mark, fill="black")
+
+        path = self.dir / "contact-sheet.jpg"
+        sheet.save(path, quality=85)
+        return path
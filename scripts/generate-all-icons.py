@@ -4,8 +4,12 @@ Generate all icons for mozart_way website using Gemini API.
 All icons will have transparent backgrounds using gemini-2.5-flash-image model.
 """
 
+import argparse
+import io
+import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -21,6 +25,12 @@ except ImportError:
     from PIL import Image
     from dotenv import load_dotenv
 
+from candidate_score import clean_background, score_candidate
+from gen_journal import Journal
+from model_registry import require
+from resize_engine import downscale, open_resized, target_size
+from staged_output import StagedRun
+
 # Load .env file from project root
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
@@ -32,7 +42,10 @@ if not api_key:
     exit(1)
 
 client = genai.Client(api_key=api_key)
+MODEL = "gemini-2.5-flash-image"
 IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
+# Losing candidates from --candidates runs, kept out of public/
+CANDIDATES_DIR = Path(__file__).parent.parent / ".candidates"
 
 # Define all icons to generate with their prompts
 # Each prompt ends with explicit transparent background requirement
@@ -135,7 +148,7 @@ def generate_icon(filename, prompt, max_size=512):
 
     try:
         response = client.models.generate_content(
-            model="gemini-2.5-flash-image",
+            model=MODEL,
             contents=prompt,
             config=types.GenerateContentConfig(
                 response_modalities=["IMAGE"],
@@ -145,28 +158,22 @@ def generate_icon(filename, prompt, max_size=512):
         for part in response.parts:
             if part.inline_data is not None:
                 filepath = IMAGES_DIR / filename
-                temp_path = filepath.with_suffix('.tmp.png')
-
-                # Save raw image first
-                raw_image = part.as_image()
-                raw_image.save(str(temp_path))
+                with StagedRun("generate-all-icons", strict=True) as run:
+                    # Raw download and final file are staged, then swapped in atomically
+                    temp_path = run.dir / f"{filepath.stem}.tmp.png"
 
-                # Open with PIL for processing
-                with Image.open(temp_path) as img:
-                    # Resize if needed
-                    if img.width > max_size or img.height > max_size:
-                        ratio = min(max_size / img.width, max_size / img.height)
-                        new_size = (int(img.width * ratio), int(img.height * ratio))
-                        img = img.resize(new_size, Image.Resampling.LANCZOS)
+                    # Save raw image first
+                    raw_image = part.as_image()
+                    raw_image.save(str(temp_path))
 
-                    # Ensure RGBA mode
-                    if img.mode != 'RGBA':
-                        img = img.convert('RGBA')
+                    # Open with PIL for processing, resized to fit max_size
+                    img, _ = open_resized(temp_path, max_size=max_size)
+                    with img:
+                        # Ensure RGBA mode
+                        if img.mode != 'RGBA':
+                            img = img.convert('RGBA')
 
-                    img.save(filepath, 'PNG', optimize=True)
-
-                # Clean up temp file
-                temp_path.unlink(missing_ok=True)
+                        img.save(run.stage(filepath), 'PNG', optimize=True)
 
                 size_kb = filepath.stat().st_size / 1024
                 print(f"[OK] Saved: {filename} ({size_kb:.1f}KB)")
@@ -179,20 +186,138 @@ def generate_icon(filename, prompt, max_size=512):
     return False
 
 
+def images_from(response):
+    """All inline images across every candidate of a response, as PIL images."""
+    images = []
+    for candidate in response.candidates or []:
+        for part in candidate.content.parts if candidate.content else []:
+            if part.inline_data is not None:
+                images.append(Image.open(io.BytesIO(part.inline_data.data)))
+    return images
+
+
+def request_candidates(prompt, count):
+    """
+    Get up to count images for one prompt: a single call with candidate_count
+    when the model accepts it, parallel single calls for whatever is missing.
+    """
+    images = []
+    try:
+        response = client.models.generate_content(
+            model=MODEL,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                response_modalities=["IMAGE"],
+                candidate_count=count,
+            ),
+        )
+        images = images_from(response)
+    except Exception as e:
+        print(f"  candidate_count={count} not accepted ({e}), using parallel calls")
+
+    missing = count - len(images)
+    if missing > 0:
+        def single_call(_):
+            try:
+                return images_from(client.models.generate_content(
+                    model=MODEL,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(response_modalities=["IMAGE"]),
+                ))
+            except Exception as e:
+                print(f"  [ERR] Candidate call failed: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=missing) as pool:
+            for result in pool.map(single_call, range(missing)):
+                images.extend(result)
+
+    return images[:count]
+
+
+def generate_icon_candidates(filename, prompt, count, max_size=512):
+    """Generate several candidates, keep the best scoring one and archive the rest."""
+    print(f"\nGenerating: {filename} ({count} candidates)")
+    print("-" * 40)
+
+    try:
+        scored = []
+        for index, raw in enumerate(request_candidates(prompt, count)):
+            img = downscale(raw, target_size(raw.size, max_size=max_size))
+            img, detection = clean_background(img)
+            total, parts = score_candidate(img)
+            scored.append((total, index, img, parts))
+            details = ", ".join(f"{k} {v:.2f}" for k, v in parts.items())
+            removed = f" ({detection['kind']} background removed)" if detection else ""
+            print(f"  #{index}: score {total:.2f} [{details}]{removed}")
+
+        if not scored:
+            print("[ERR] Failed: no candidates returned")
+            return False
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        best_score, best_index, best, _ = scored[0]
+
+        filepath = IMAGES_DIR / filename
+        with StagedRun("generate-all-icons", strict=True) as run:
+            best.save(run.stage(filepath), 'PNG', optimize=True)
+
+        archive = CANDIDATES_DIR / filepath.stem
+        archive.mkdir(parents=True, exist_ok=True)
+        scores = {}
+        for total, index, img, parts in scored[1:]:
+            img.save(archive / f"{filepath.stem}.{index}.png", 'PNG')
+            scores[index] = {"score": round(total, 3), **{k: round(v, 3) for k, v in parts.items()}}
+        (archive / "scores.json").write_text(json.dumps(
+            {"kept": best_index, "kept_score": round(best_score, 3), "archived": scores}, indent=2))
+
+        size_kb = filepath.stat().st_size / 1024
+        print(f"[OK] Saved: {filename} (#{best_index}, score {best_score:.2f}, {size_kb:.1f}KB)")
+        return True
+
+    except Exception as e:
+        print(f"[ERR] Failed: {e}")
+        return False
+
+
 def main():
     """Generate all icons."""
+    parser = argparse.ArgumentParser(description="Generate all icons")
+    parser.add_argument("--candidates", type=int, default=1,
+                        help="candidates per prompt; the best scoring one is kept")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="also regenerate icons whose last attempt failed")
+    args = parser.parse_args()
+
     print("=" * 50)
     print("Mozart Way - Icon Generator (Transparent BG)")
     print("=" * 50)
-    print(f"Model: gemini-2.5-flash-image")
+    print(f"Model: {MODEL}")
     print(f"Output: {IMAGES_DIR}")
     print(f"Icons: {len(ICONS)}")
 
+    # Fail before any paid call if the model isn't available
+    require(MODEL, client=client)
+
+    # Resume: skip icons that already succeeded with the same prompt
+    journal = Journal("generate-all-icons")
+    todo = {filename: prompt for filename, prompt in ICONS.items()
+            if journal.needs_work(filename, prompt, IMAGES_DIR / filename, args.retry_failed)}
+    print(f"To generate: {len(todo)} (journal: {journal.path})")
+
     success = 0
     failed = 0
 
-    for filename, prompt in ICONS.items():
-        if generate_icon(filename, prompt):
+    for filename, prompt in todo.items():
+        started = journal.start(filename, prompt)
+        if args.candidates > 1:
+            ok = generate_icon_candidates(filename, prompt, args.candidates)
+        else:
+            ok = generate_icon(filename, prompt)
+        journal.finish(filename, prompt, started, IMAGES_DIR / filename,
+                       None if ok else "generation failed")
+
+        if ok:
             success += 1
         else:
             failed += 1
@@ -9,13 +9,15 @@ from pathlib import Path
 try:
     from google import genai
     from google.genai import types
-    from PIL import Image
 except ImportError:
     print("Installing dependencies...")
     os.system("pip install google-genai Pillow")
     from google import genai
     from google.genai import types
-    from PIL import Image
+
+from model_registry import require, validate
+from resize_engine import open_resized
+from staged_output import StagedRun
 
 # Initialize client
 api_key = os.environ.get("GEMINI_API_KEY")
@@ -25,14 +27,20 @@ if not api_key:
 
 client = genai.Client(api_key=api_key)
 IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
+MODEL = "gemini-3-pro-image-preview"
 
 def generate_image(prompt: str, filename: str, aspect_ratio: str = "1:1", max_width: int = 800):
     """Generate and save an optimized image."""
     print(f"Generating: {filename}...")
 
+    problems = validate(MODEL, aspect_ratio, client=client)
+    if problems:
+        print(f"  [ERR] {filename}: {'; '.join(problems)}")
+        return False
+
     try:
         response = client.models.generate_content(
-            model="gemini-3-pro-image-preview",
+            model=MODEL,
             contents=[prompt],
             config=types.GenerateContentConfig(
                 response_modalities=['IMAGE'],
@@ -46,32 +54,26 @@ def generate_image(prompt: str, filename: str, aspect_ratio: str = "1:1", max_wi
             if part.inline_data:
                 # Save raw bytes first
                 filepath = IMAGES_DIR / filename
-                temp_path = filepath.with_suffix('.tmp.jpg')
-
-                # Get raw image data
-                raw_img = part.as_image()
-                raw_img.save(str(temp_path))
-
-                # Open with PIL for processing
-                with Image.open(temp_path) as img:
-                    # Resize for web
-                    if img.width > max_width:
-                        ratio = max_width / img.width
-                        new_height = int(img.height * ratio)
-                        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-                    # Convert to RGB if needed
-                    if img.mode == 'RGBA' and not filename.endswith('.png'):
-                        img = img.convert('RGB')
-
-                    # Save as optimized file
-                    if filename.endswith('.png'):
-                        img.save(filepath, 'PNG', optimize=True)
-                    else:
-                        img.save(filepath, 'JPEG', quality=85, optimize=True)
-
-                # Remove temp file
-                temp_path.unlink(missing_ok=True)
+                with StagedRun("generate-decorations", strict=True) as run:
+                    # Raw download and final file are staged, then swapped in atomically
+                    temp_path = run.dir / f"{filepath.stem}.tmp.jpg"
+
+                    # Get raw image data
+                    raw_img = part.as_image()
+                    raw_img.save(str(temp_path))
+
+                    # Open with PIL for processing
+                    img, _ = open_resized(temp_path, max_width=max_width)
+                    with img:
+                        # Convert to RGB if needed
+                        if img.mode == 'RGBA' and not filename.endswith('.png'):
+                            img = img.convert('RGB')
+
+                        # Save as optimized file
+                        if filename.endswith('.png'):
+                            img.save(run.stage(filepath), 'PNG', optimize=True)
+                        else:
+                            img.save(run.stage(filepath), 'JPEG', quality=85, optimize=True)
 
                 size_kb = filepath.stat().st_size / 1024
                 print(f"  [OK] Saved: {filename} ({size_kb:.0f}KB)")
@@ -84,6 +86,9 @@ def generate_image(prompt: str, filename: str, aspect_ratio: str = "1:1", max_wi
 def main():
     print("Generating logo and decorations...\n")
 
+    # Fail before any paid call if the model isn't available
+    require(MODEL, client=client)
+
     # 1. LOGO - Clean, modern, minimal
     generate_image(
         prompt="""Create a minimal, modern logo for 'Web Studio' - a web design agency.
@@ -1,9 +1,36 @@
 """
 Generate portfolio images using Gemini API
+
+--draft iterates on prompts with a cheap model into .drafts/generate-images/,
+--approve marks drafts as good and --promote renders only those at final quality.
 """
+import argparse
 import os
 from pathlib import Path
 
+from gen_tiers import DRAFT_IMAGE_SIZE, DRAFT_MODEL, Staging
+
+parser = argparse.ArgumentParser(description="Generate portfolio images")
+parser.add_argument("--retry-failed", action="store_true",
+                    help="also regenerate images whose last attempt failed")
+tier = parser.add_mutually_exclusive_group()
+tier.add_argument("--draft", action="store_true",
+                  help=f"cheap drafts with {DRAFT_MODEL} into the staging folder")
+tier.add_argument("--approve", nargs="+", metavar="FILENAME",
+                  help="approve the current drafts of these images")
+tier.add_argument("--promote", action="store_true",
+                  help="regenerate only approved drafts at final quality")
+args = parser.parse_args()
+
+staging = Staging("generate-images")
+
+if args.approve:
+    missing = staging.approve(args.approve)
+    for name in missing:
+        print(f"[SKIP] {name}: no successful draft to approve")
+    print(f"Approved: {len(args.approve) - len(missing)} (run with --promote to render at final quality)")
+    exit(0)
+
 # Check for API key
 api_key = os.environ.get("GEMINI_API_KEY")
 if not api_key:
@@ -14,31 +41,47 @@ if not api_key:
 from google import genai
 from google.genai import types
 
+from gen_journal import Journal
+from model_registry import require
+from staged_output import StagedRun
+
 client = genai.Client(api_key=api_key)
+MODEL = "gemini-3-pro-image-preview"
+IMAGE_SIZE = "2K"
 output_dir = Path(__file__).parent.parent / "public" / "images"
 output_dir.mkdir(parents=True, exist_ok=True)
 
+# Draft tier: cheaper model, default size, staging folder, separate journal
+if args.draft:
+    model, image_size = DRAFT_MODEL, DRAFT_IMAGE_SIZE
+    output_path, journal = staging.path, staging.journal
+else:
+    model, image_size = MODEL, IMAGE_SIZE
+    output_path, journal = (lambda name: output_dir / name), Journal("generate-images")
+
 def generate_image(prompt: str, filename: str, aspect_ratio: str = "16:9"):
     """Generate a single image with Gemini"""
     print(f"Generating: {filename}...")
 
+    image_config = {"aspect_ratio": aspect_ratio}
+    if image_size:
+        image_config["image_size"] = image_size
+
     response = client.models.generate_content(
-        model="gemini-3-pro-image-preview",
+        model=model,
         contents=[prompt],
         config=types.GenerateContentConfig(
             response_modalities=['IMAGE'],
-            image_config=types.ImageConfig(
-                aspect_ratio=aspect_ratio,
-                image_size="2K"
-            ),
+            image_config=types.ImageConfig(**image_config),
         ),
     )
 
     for part in response.parts:
         if part.inline_data:
             image = part.as_image()
-            filepath = output_dir / filename
-            image.save(str(filepath))
+            filepath = output_path(filename)
+            with StagedRun("generate-images", strict=True) as run:
+                image.save(str(run.stage(filepath)))
             print(f"  Saved: {filepath}")
             return True
 
@@ -112,10 +155,33 @@ print("=" * 50)
 
 all_images = portfolio_images + hero_images + service_images + decorative
 
-for img in all_images:
+# Resume: skip images that already succeeded with the same prompt
+todo = [img for img in all_images
+        if journal.needs_work(img["filename"], img["prompt"], output_path(img["filename"]), args.retry_failed)]
+if args.promote:
+    todo = [img for img in all_images if staging.is_approved(img["filename"], img["prompt"])]
+print(f"To generate: {len(todo)} of {len(all_images)} (journal: {journal.path})")
+
+# Fail before any paid call if the model or an aspect ratio isn't supported
+for img in todo:
+    require(model, img["aspect"], image_size, client=client)
+
+for img in todo:
+    started = journal.start(img["filename"], img["prompt"])
+    error = None
     try:
-        generate_image(img["prompt"], img["filename"], img["aspect"])
+        if not generate_image(img["prompt"], img["filename"], img["aspect"]):
+            error = "no image in response"
     except Exception as e:
         print(f"  Error: {e}")
+        error = str(e)
+    if journal.finish(img["filename"], img["prompt"], started, output_path(img["filename"]), error) and args.promote:
+        staging.promoted(img["filename"])
 
-print("\nDone! Check public/images/ folder")
+print(f"\nJournal: {journal.summary()}")
+if args.draft:
+    sheet = staging.contact_sheet([img["filename"] for img in all_images])
+    print(f"\nDrafts in {staging.dir}, contact sheet: {sheet}")
+    print("Approve with --approve FILENAME ..., then --promote")
+else:
+    print("\nDone! Check public/images/ folder")
@@ -10,13 +10,15 @@ from pathlib import Path
 try:
     from google import genai
     from google.genai import types
-    from PIL import Image
 except ImportError:
     print("Installing dependencies...")
     os.system("pip install google-genai Pillow")
     from google import genai
     from google.genai import types
-    from PIL import Image
+
+from model_registry import require
+from resize_engine import open_resized
+from staged_output import StagedRun
 
 api_key = os.environ.get("GEMINI_API_KEY")
 if not api_key:
@@ -26,11 +28,15 @@ if not api_key:
 
 client = genai.Client(api_key=api_key)
 IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
+MODEL = "gemini-3-pro-image-preview"
 
 def generate_logo():
     """Generate Mozart silhouette logo with transparent background."""
     print("Generating Mozart silhouette logo...\n")
 
+    # Fail before the paid call if the model or aspect ratio isn't supported
+    require(MODEL, "1:1", client=client)
+
     prompt = """Create a minimalist icon of Mozart's profile silhouette.
     Design requirements:
     - Side profile view of Mozart with his iconic 18th century wig (baroque style)
@@ -45,7 +51,7 @@ def generate_logo():
 
     try:
         response = client.models.generate_content(
-            model="gemini-3-pro-image-preview",
+            model=MODEL,
             contents=[prompt],
             config=types.GenerateContentConfig(
                 response_modalities=['IMAGE'],
@@ -58,26 +64,23 @@ def generate_logo():
         for part in response.parts:
             if part.inline_data:
                 filepath = IMAGES_DIR / "logo-icon.png"
-                temp_path = filepath.with_suffix('.tmp.png')
+                with StagedRun("generate-logo", strict=True) as run:
+                    # Raw download and final file are staged, then swapped in atomically
+                    temp_path = run.dir / f"{filepath.stem}.tmp.png"
 
-                raw_img = part.as_image()
-                raw_img.save(str(temp_path))
+                    raw_img = part.as_image()
+                    raw_img.save(str(temp_path))
 
-                with Image.open(temp_path) as img:
                     # Resize to reasonable icon size
                     max_width = 200
-                    if img.width > max_width:
-                        ratio = max_width / img.width
-                        new_height = int(img.height * ratio)
-                        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-                    # Keep RGBA for transparency
-                    if img.mode != 'RGBA':
-                        img = img.convert('RGBA')
+                    img, _ = open_resized(temp_path, max_width=max_width)
+                    with img:
+                        # Keep RGBA for transparency
+                        if img.mode != 'RGBA':
+                            img = img.convert('RGBA')
 
-                    img.save(filepath, 'PNG', optimize=True)
+                        img.save(run.stage(filepath), 'PNG', optimize=True)
 
-                temp_path.unlink(missing_ok=True)
                 size_kb = filepath.stat().st_size / 1024
                 print(f"[OK] Saved: logo-icon.png ({size_kb:.0f}KB)")
                 print(f"     Path: {filepath}")
@@ -10,13 +10,15 @@ from pathlib import Path
 try:
     from google import genai
     from google.genai import types
-    from PIL import Image
 except ImportError:
     print("Installing dependencies...")
     os.system("pip install google-genai Pillow")
     from google import genai
     from google.genai import types
-    from PIL import Image
+
+from model_registry import require, validate
+from resize_engine import open_resized
+from staged_output import StagedRun
 
 api_key = os.environ.get("GEMINI_API_KEY")
 if not api_key:
@@ -25,14 +27,20 @@ if not api_key:
 
 client = genai.Client(api_key=api_key)
 IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
+MODEL = "gemini-3-pro-image-preview"
 
 def generate_image(prompt: str, filename: str, aspect_ratio: str = "1:1", max_width: int = 800):
     """Generate and save an optimized image."""
     print(f"Generating: {filename}...")
 
+    problems = validate(MODEL, aspect_ratio, client=client)
+    if problems:
+        print(f"  [ERR] {filename}: {'; '.join(problems)}")
+        return False
+
     try:
         response = client.models.generate_content(
-            model="gemini-3-pro-image-preview",
+            model=MODEL,
             contents=[prompt],
             config=types.GenerateContentConfig(
                 response_modalities=['IMAGE'],
@@ -45,26 +53,22 @@ def generate_image(prompt: str, filename: str, aspect_ratio: str = "1:1", max_wi
         for part in response.parts:
             if part.inline_data:
                 filepath = IMAGES_DIR / filename
-                temp_path = filepath.with_suffix('.tmp.jpg')
-
-                raw_img = part.as_image()
-                raw_img.save(str(temp_path))
-
-                with Image.open(temp_path) as img:
-                    if img.width > max_width:
-                        ratio = max_width / img.width
-                        new_height = int(img.height * ratio)
-                        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-                    if img.mode == 'RGBA' and not filename.endswith('.png'):
-                        img = img.convert('RGB')
-
-                    if filename.endswith('.png'):
-                        img.save(filepath, 'PNG', optimize=True)
-                    else:
-                        img.save(filepath, 'JPEG', quality=85, optimize=True)
-
-                temp_path.unlink(missing_ok=True)
+                with StagedRun("generate-mozart-graphics", strict=True) as run:
+                    # Raw download and final file are staged, then swapped in atomically
+                    temp_path = run.dir / f"{filepath.stem}.tmp.jpg"
+
+                    raw_img = part.as_image()
+                    raw_img.save(str(temp_path))
+
+                    img, _ = open_resized(temp_path, max_width=max_width)
+                    with img:
+                        if img.mode == 'RGBA' and not filename.endswith('.png'):
+                            img = img.convert('RGB')
+
+                        if filename.endswith('.png'):
+                            img.save(run.stage(filepath), 'PNG', optimize=True)
+                        else:
+                            img.save(run.stage(filepath), 'JPEG', quality=85, optimize=True)
                 size_kb = filepath.stat().st_size / 1024
                 print(f"  [OK] Saved: {filename} ({size_kb:.0f}KB)")
                 return True
@@ -76,6 +80,9 @@ def generate_image(prompt: str, filename: str, aspect_ratio: str = "1:1", max_wi
 def main():
     print("Generating Mozart-themed graphics...\n")
 
+    # Fail before any paid call if the model isn't available
+    require(MODEL, client=client)
+
     # Color scheme reference for prompts - TRANSPARENT backgrounds
     colors = "violet (#7c3aed), purple (#8b5cf6), deep blue (#3b82f6)"
     transparent = "TRANSPARENT background, NO background, PNG with alpha channel"
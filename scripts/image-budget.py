@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Per-route image weight budget report.
+Follows the imports of every route in src/router.tsx, collects the image
+paths the components reference and checks their bytes against
+image-budgets.json. Exits with status 1 when a budget is exceeded.
+
+Route budgets are ratchets set just above the measured weights, so the
+gate catches regressions; lower them as images get lighter. default_kb
+applies to routes without an entry (new landings).
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+SRC_DIR = ROOT / "src"
+PUBLIC_DIR = ROOT / "public"
+BUDGETS_FILE = Path(__file__).parent / "image-budgets.json"
+
+FORMATS = {
+    ".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png",
+    ".webp": "webp", ".avif": "avif", ".svg": "svg", ".gif": "gif",
+}
+
+IMPORT_RE = re.compile(r"""(?:import|export)\s+(?:[^'"]*?\s+from\s+)?['"]([^'"]+)['"]""")
+ASSET_RE = re.compile(r"""/(?:images|education|mastermode)/[^'"`()\s]+?\.(?:jpe?g|png|webp|avif|svg|gif)""")
+TEMPLATE_ASSET_RE = re.compile(r"""`(/(?:images|education|mastermode)/[^`]*\$\{[^`]*)`""")
+ROUTE_RE = re.compile(r"""path:\s*['"]([^'"]+)['"],\s*element:\s*<(\w+)""")
+PAGE_MAP_RE = re.compile(r"""['"]([\w-]+)['"]:\s*(\w+),""")
+
+
+def resolve_import(source: Path, spec: str):
+    """Resolve a relative or '@/' import to a file under src/."""
+    if spec.startswith("@/"):
+        base = SRC_DIR / spec[2:]
+    elif spec.startswith("."):
+        base = source.parent / spec
+    else:
+        return None  # package import
+
+    for candidate in (base, *(base.with_name(base.name + ext) for ext in (".tsx", ".ts", ".jsx", ".js")),
+                      base / "index.tsx", base / "index.ts"):
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def collect_assets(entry: Path) -> set:
+    """Return the public asset paths referenced by entry and everything it imports."""
+    seen = set()
+    assets = set()
+    stack = [entry.resolve()]
+
+    while stack:
+        source = stack.pop()
+        if source in seen or source.suffix not in (".tsx", ".ts", ".jsx", ".js"):
+            continue
+        seen.add(source)
+        text = source.read_text(encoding="utf-8")
+
+        assets.update(ASSET_RE.findall(text))
+
+        # `/education/brand/mozart-way-${variant}.svg` -> every file the pattern can match
+        for template in TEMPLATE_ASSET_RE.findall(text):
+            pattern = re.sub(r"\$\{[^}]*\}", "*", template).lstrip("/")
+            assets.update("/" + p.relative_to(PUBLIC_DIR).as_posix() for p in PUBLIC_DIR.glob(pattern))
+
+        for spec in IMPORT_RE.findall(text):
+            target = resolve_import(source, spec)
+            if target:
+                stack.append(target)
+
+    return assets
+
+
+def find_routes() -> dict:
+    """Map each route path to its page component file."""
+    router = SRC_DIR / "router.tsx"
+    text = router.read_text(encoding="utf-8")
+
+    imports = {}
+    for match in re.finditer(r"""import\s+(\w+)\s+from\s+['"]([^'"]+)['"]""", text):
+        target = resolve_import(router, match.group(2))
+        if target:
+            imports[match.group(1)] = target
+
+    routes = {path: imports[name] for path, name in ROUTE_RE.findall(text) if name in imports}
+
+    # "/" renders the featured landing from site.config.json, HomePage otherwise
+    config = json.loads((ROOT / "site.config.json").read_text(encoding="utf-8"))
+    page_map = dict(PAGE_MAP_RE.findall(text))
+    featured = config.get("featured")
+    root_component = page_map.get(featured, "HomePage") if featured else "HomePage"
+    if root_component in imports:
+        routes["/"] = imports[root_component]
+
+    return routes
+
+
+def asset_weights(assets: set) -> dict:
+    """
+    Sum bytes per format for a set of referenced assets.
+
+    Assets are grouped by stem (hero-bg.jpg + hero-bg.webp are one image).
+    "shipped" counts the smallest variant the code references, the per-format
+    columns count that format's sibling on disk, falling back to the shipped one.
+    """
+    stems = {}
+    for asset in assets:
+        path = PUBLIC_DIR / asset.lstrip("/")
+        if path.is_file():
+            stems.setdefault(path.with_suffix(""), []).append(path)
+
+    totals = {"shipped": 0, "jpeg": 0, "webp": 0, "avif": 0}
+    for stem, referenced in stems.items():
+        shipped = min(p.stat().st_size for p in referenced)
+        totals["shipped"] += shipped
+
+        for fmt, suffixes in (("jpeg", (".jpg", ".jpeg", ".png")), ("webp", (".webp",)), ("avif", (".avif",))):
+            sibling = next((stem.with_suffix(s) for s in suffixes if stem.with_suffix(s).is_file()), None)
+            totals[fmt] += sibling.stat().st_size if sibling else shipped
+
+    totals["files"] = len(stems)
+    return totals
+
+
+def main():
+    budgets = json.loads(BUDGETS_FILE.read_text(encoding="utf-8"))
+    default_budget = budgets.get("default_kb")
+
+    from lcp_preload import HINT_RE  # lcp_preload loads this script itself
+
+    # index.html preloads are fetched on every route, the LCP hint only on "/"
+    html = (ROOT / "index.html").read_text(encoding="utf-8")
+    document_assets = set(ASSET_RE.findall(HINT_RE.sub("", html)))
+    hint_assets = set(ASSET_RE.findall("".join(m.group(0) for m in HINT_RE.finditer(html))))
+
+    print("Image weight per route\n")
+    print(f"{'route':<14} {'files':>5} {'shipped':>9} {'jpeg/png':>9} {'webp':>9} {'avif':>9} {'budget':>9}")
+
+    over_budget = []
+    for route, entry in sorted(find_routes().items()):
+        assets = collect_assets(entry) | document_assets
+        if route == "/":
+            assets |= hint_assets
+        weights = asset_weights(assets)
+        budget = budgets.get("routes", {}).get(route, default_budget)
+
+        shipped_kb = weights["shipped"] / 1024
+        status = ""
+        if budget is not None and shipped_kb > budget:
+            status = "  [OVER]"
+            over_budget.append(route)
+
+        budget_text = f"{budget}KB" if budget is not None else "-"
+        print(f"{route:<14} {weights['files']:>5} {shipped_kb:>7.0f}KB {weights['jpeg']/1024:>7.0f}KB "
+              f"{weights['webp']/1024:>7.0f}KB {weights['avif']/1024:>7.0f}KB {budget_text:>9}{status}")
+
+    if over_budget:
+        print(f"\n[ERR] Over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+    print("\n[OK] All routes within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Preload hint for the Largest Contentful Paint image of the "/" route.
+Resolves the featured landing from site.config.json, finds the image its
+Hero component paints and writes a <link rel="preload" fetchpriority="high">
+for it into index.html, so the download starts before React mounts.
+
+Every route is served from index.html, so the link is added by an inline
+script only when the page is "/"; other landings would otherwise fetch the
+hero at high priority next to their own LCP image.
+
+Preloads follow the image manifest, so once hashed copies are in use the
+hints fetch the same URLs the components resolve to.
+
+optimize-images.py and watch-images.py call update_index_html() after
+regenerating variants; run this file directly after changing the landing.
+"""
+
+import json
+import re
+from pathlib import Path
+
+from PIL import Image
+
+from asset_hash import HASH_LENGTH, MANIFEST_FILE, is_hashed
+from script_loader import load_script
+from staged_output import rewrite_shared
+
+ROOT = Path(__file__).parent.parent
+PUBLIC_DIR = ROOT / "public"
+INDEX_HTML = ROOT / "index.html"
+
+MIME_TYPES = {
+    ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png",
+    ".webp": "image/webp", ".avif": "image/avif",
+}
+
+# <img src> / <source srcSet> in source order, plain or through resolveAsset();
+# CSS backgrounds aren't the LCP element here
+TAG_RE = re.compile(r"""<(?:img|source)\b[^>]*?\b(?:src|srcSet)=(?:\{resolveAsset\()?["']([^"']+)["']""", re.S)
+STATIC_PRELOAD_RE = re.compile(r"""(<link rel="preload" as="image" href=")([^"]+)(")""")
+MARKER = "<!-- LCP preload: generated by scripts/lcp_preload.py -->"
+HINT_RE = re.compile(r"[ \t]*" + re.escape(MARKER) + r"\n[ \t]*(?:<link [^>]*>|<script>.*?</script>)\n", re.S)
+
+_budget = load_script("image_budget", "image-budget.py")
+
+
+def find_hero_component(page: Path) -> Path:
+    """First component named Hero reachable from the page (the page itself otherwise)."""
+    queue, seen = [page.resolve()], set()
+    while queue:
+        source = queue.pop(0)
+        if source in seen:
+            continue
+        seen.add(source)
+        if source.stem == "Hero":
+            return source
+        text = source.read_text(encoding="utf-8")
+        queue += [t for t in (_budget.resolve_import(source, s) for s in _budget.IMPORT_RE.findall(text)) if t]
+    return page
+
+
+def hero_image(component: Path):
+    """Public path of the hero image: first tagged image named *hero*, else the first tagged one."""
+    text = component.read_text(encoding="utf-8")
+    tagged = [url.split()[0] for url in TAG_RE.findall(text) if _budget.ASSET_RE.fullmatch(url.split()[0])]
+    if not tagged:
+        found = _budget.ASSET_RE.findall(text)
+        return found[0] if found else None
+    return next((url for url in tagged if "hero" in Path(url).stem), tagged[0])
+
+
+def variants(url: str) -> list:
+    """(url, width) for the image and its width variants (name-800.webp), widest last."""
+    path = PUBLIC_DIR / url.lstrip("/")
+    width_re = re.compile(rf"{re.escape(path.stem)}-(\d+)w?{re.escape(path.suffix)}$")
+
+    found = [path] if path.is_file() else []
+    found += [p for p in path.parent.glob(f"{path.stem}-*{path.suffix}") if width_re.match(p.name)]
+
+    sized = []
+    for p in found:
+        with Image.open(p) as img:
+            sized.append(("/" + p.relative_to(PUBLIC_DIR).as_posix(), img.width))
+    return sorted(set(sized), key=lambda v: v[1])
+
+
+def resolve_asset(url: str, manifest: dict) -> str:
+    """Same mapping as resolveAsset() in src/lib/image-manifest.ts, from any earlier name."""
+    path = Path(url)
+    if is_hashed(path):
+        url = path.with_name(path.stem[:-HASH_LENGTH - 1] + path.suffix).as_posix()
+    return manifest.get(url, url)
+
+
+def load_image_manifest() -> dict:
+    if not MANIFEST_FILE.exists():
+        return {}
+    return json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+
+
+def preload_script(url: str):
+    """Inline script adding the preload link on "/" only (indented for <head>)."""
+    manifest = load_image_manifest()
+    # Preload the URLs the components request, hashed copies included
+    sized = [(resolve_asset(u, manifest), w) for u, w in variants(url)]
+    if not sized:
+        return None
+
+    srcset = ", ".join(f"{u} {w}w" for u, w in sized)
+    mime = MIME_TYPES.get(Path(url).suffix.lower(), "image/*")
+    return "\n".join([
+        "<script>",
+        "      if (location.pathname === '/') {",
+        "        var hint = document.createElement('link');",
+        "        hint.rel = 'preload';",
+        "        hint.as = 'image';",
+        f"        hint.href = '{sized[-1][0]}';",
+        f"        hint.setAttribute('imagesrcset', '{srcset}');",
+        "        hint.setAttribute('imagesizes', '100vw');",
+        f"        hint.type = '{mime}';",
+        "        hint.setAttribute('fetchpriority', 'high');",
+        "        document.head.appendChild(hint);",
+        "      }",
+        "    </script>",
+    ])
+
+
+def update_index_html() -> str:
+    """Insert or refresh the hint; returns the preloaded path (None when nothing to preload)."""
+    page = _budget.find_routes().get("/")
+    url = hero_image(find_hero_component(page)) if page else None
+    tag = preload_script(url) if url else None
+
+    manifest = load_image_manifest()
+
+    def update(html):
+        stripped = HINT_RE.sub("", html)
+        stripped = STATIC_PRELOAD_RE.sub(lambda m: m[1] + resolve_asset(m[2], manifest) + m[3], stripped)
+        if tag:
+            anchor = "    <!-- Preload critical images -->"
+            block = f"    {MARKER}\n    {tag}\n"
+            if anchor in stripped:
+                stripped = stripped.replace(anchor, block + anchor, 1)
+            else:
+                stripped = stripped.replace("  </head>", block + "  </head>", 1)
+        return stripped
+
+    # The watcher and optimize-images both refresh the hint
+    rewrite_shared(INDEX_HTML, update)
+    return url if tag else None
+
+
+def main():
+    url = update_index_html()
+    if url:
+        print(f"[OK] index.html preloads {url}")
+    else:
+        print("[SKIP] No hero image found for the featured landing")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,26 @@
 #!/usr/bin/env python3
-"""List available Gemini models."""
+"""List available Gemini models (cached, see model_registry.py)."""
 
-import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
-from google import genai
+from model_registry import capabilities, load_models
 
-api_key = os.environ.get("GEMINI_API_KEY")
-client = genai.Client(api_key=api_key)
+refresh = "--refresh" in sys.argv
+models = load_models(refresh=refresh)
 
 print("Available models:")
 print("=" * 60)
 
-for model in client.models.list():
-    name = model.name
-    if 'image' in name.lower() or 'imagen' in name.lower():
-        print(f"[IMAGE] {name}")
+for model in models:
+    name = model["name"]
+    caps = capabilities(name)
+    if caps["image_output"]:
+        sizes = f" sizes: {', '.join(caps['image_sizes'])}" if caps["image_sizes"] else ""
+        print(f"[IMAGE] {name}{sizes}")
     elif 'gemini' in name.lower():
         print(f"        {name}")
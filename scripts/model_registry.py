@@ -0,0 +1,103 @@
+"""
+Cached Gemini model registry shared by the generator scripts.
+client.models.list() is fetched at most once per TTL and cached on disk,
+so generators can validate model / aspect ratio / size before a paid call.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+CACHE_FILE = Path(__file__).parent.parent / ".cache" / "gemini-models.json"
+CACHE_TTL = 24 * 60 * 60  # seconds
+
+_models = None  # in-process copy of the cache
+
+# The models API doesn't report image options, so they live here
+ASPECT_RATIOS = ["1:1", "2:3", "3:2", "3:4", "4:3", "4:5", "5:4", "9:16", "16:9", "21:9"]
+IMAGE_CAPABILITIES = {
+    "gemini-2.5-flash-image": {"aspect_ratios": ASPECT_RATIOS, "image_sizes": []},
+    "gemini-3-pro-image-preview": {"aspect_ratios": ASPECT_RATIOS, "image_sizes": ["1K", "2K", "4K"]},
+}
+
+
+def _short(name: str) -> str:
+    return name.removeprefix("models/")
+
+
+def _fetch(client) -> list:
+    if client is None:
+        from google import genai
+        client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+
+    models = []
+    for model in client.models.list():
+        models.append({
+            "name": _short(model.name),
+            "display_name": getattr(model, "display_name", None),
+            "actions": list(getattr(model, "supported_actions", None) or []),
+        })
+    return models
+
+
+def load_models(client=None, refresh: bool = False) -> list:
+    """Model list from the disk cache, hitting the API only when it's stale."""
+    global _models
+    if _models is not None and not refresh:
+        return _models
+
+    if not refresh and CACHE_FILE.exists():
+        cached = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        if time.time() - cached.get("fetched", 0) < CACHE_TTL:
+            _models = cached["models"]
+            return _models
+
+    models = _fetch(client)
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"fetched": time.time(), "models": models}, indent=2), encoding="utf-8")
+    tmp.replace(CACHE_FILE)
+    _models = models
+    return models
+
+
+def capabilities(name: str, client=None) -> dict:
+    """Capabilities of a model, or None when the API doesn't list it."""
+    name = _short(name)
+    listed = {m["name"]: m for m in load_models(client)}
+    if name not in listed:
+        return None
+
+    known = IMAGE_CAPABILITIES.get(name)
+    return {
+        **listed[name],
+        "image_output": known is not None or "image" in name,
+        "aspect_ratios": known["aspect_ratios"] if known else [],
+        "image_sizes": known["image_sizes"] if known else [],
+    }
+
+
+def validate(model: str, aspect_ratio: str = None, image_size: str = None, client=None) -> list:
+    """Problems with a generation config; an empty list means it's safe to send."""
+    caps = capabilities(model, client)
+    if caps is None:
+        return [f"model '{model}' is not available (see list-models.py)"]
+
+    problems = []
+    if not caps["image_output"]:
+        problems.append(f"model '{model}' does not produce images")
+    if aspect_ratio and caps["aspect_ratios"] and aspect_ratio not in caps["aspect_ratios"]:
+        problems.append(f"aspect ratio {aspect_ratio} not supported by {model}")
+    if image_size and image_size not in caps["image_sizes"]:
+        problems.append(f"image size {image_size} not supported by {model}")
+    return problems
+
+
+def require(model: str, aspect_ratio: str = None, image_size: str = None, client=None):
+    """Print the problems and exit before any paid request is sent."""
+    problems = validate(model, aspect_ratio, image_size, client)
+    if problems:
+        for problem in problems:
+            print(f"[ERR] {problem}")
+        exit(1)
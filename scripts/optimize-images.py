@@ -4,22 +4,33 @@ Optimize images for web performance.
 Compresses and resizes images to reasonable web sizes.
 """
 
+import argparse
+import io
 import os
+import time
 from pathlib import Path
 
 try:
-    from PIL import Image
+    from PIL import Image, ImageCms, ImageOps
 except ImportError:
     print("Installing Pillow...")
     os.system("pip install Pillow")
-    from PIL import Image
+    from PIL import Image, ImageCms, ImageOps
+
+from asset_hash import is_hashed, manifest_in_use, refresh_hashed, update_vercel_headers
+from encode_pool import configure as configure_encoders, encode_all
+from lcp_preload import update_index_html
+from resize_engine import open_resized, psnr, single_pass, stored_target_size
+from staged_output import StagedRun
 
 IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
 
 # Target sizes and quality settings
+# "progressive" / "subsampling" (e.g. "4:2:0", "4:4:4") select the photo JPEG
+# profile: sRGB pixels, no EXIF/ICC blobs, progressive scans.
 SETTINGS = {
-    "case-": {"max_width": 1200, "quality": 85},  # Portfolio images
-    "hero-": {"max_width": 1920, "quality": 80},  # Hero background
+    "case-": {"max_width": 1200, "quality": 85, "progressive": True},  # Portfolio images
+    "hero-": {"max_width": 1920, "quality": 80, "progressive": True},  # Hero background
     "service-": {"max_width": 800, "quality": 85},  # Service cards
     "blob-": {"max_width": 400, "quality": 85},  # Decorative blobs
 }
@@ -30,59 +41,226 @@ def get_settings(filename: str) -> dict:
             return settings
     return {"max_width": 1200, "quality": 85}
 
-def optimize_image(filepath: Path) -> None:
+SRGB_PROFILE = ImageCms.createProfile("sRGB")
+
+def to_srgb(img):
+    """
+    RGB pixels in sRGB. The embedded profile is applied to the image in its own
+    mode, so grayscale and CMYK profiles convert too; without one, just to RGB.
+    """
+    icc = img.info.get("icc_profile")
+    if not icc:
+        return img.convert("RGB")
+    if img.mode not in ("L", "RGB", "CMYK"):
+        img = img.convert("RGB")  # alpha/palette modes carry an RGB profile
+    source = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+    return ImageCms.profileToProfile(img, source, SRGB_PROFILE, outputMode="RGB")
+
+def encoded_size(img, **params) -> int:
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", **params)
+    return buffer.tell()
+
+def photo_jpeg_jobs(img, filepath: Path, settings: dict):
+    """
+    Encode jobs for the photo JPEG profile: a trial encode per measure plus the final file.
+    Each measure is applied on top of the previous ones so the savings add up.
+    Returns (jobs, measures) where measures lists the steps in order.
+    """
+    metadata = {k: img.info[k] for k in ("exif", "icc_profile") if img.info.get(k)}
+    img = to_srgb(img)
+    params = {"quality": settings["quality"], "optimize": True}
+
+    steps = [("baseline", {**params, **metadata}), ("metadata", params)]
+    if settings.get("progressive"):
+        params = {**params, "progressive": True}
+        steps.append(("progressive", params))
+    if settings.get("subsampling"):
+        params = {**params, "subsampling": settings["subsampling"]}
+        steps.append(("subsampling", params))
+
+    # Each job gets its own copy: save() keeps per-call state on the image
+    jobs = {f"jpeg:{label}": (lambda im=img.copy(), p=p: encoded_size(im, **p)) for label, p in steps[:-1]}
+
+    def write(im=img.copy(), p=params):
+        im.save(filepath, "JPEG", **p)
+        return filepath.stat().st_size
+
+    jobs["jpeg"] = write
+    return jobs, [label for label, _ in steps]
+
+def bytes_saved(results: dict, measures: list) -> dict:
+    """Bytes saved by each measure from the trial encode sizes."""
+    sizes = [results[f"jpeg:{label}"][0] for label in measures[:-1]] + [results["jpeg"][0]]
+    return {measures[i]: sizes[i - 1] - sizes[i] for i in range(1, len(measures))}
+
+def optimize_image(filepath: Path, verify: bool = False, run: StagedRun = None, quick: bool = False) -> dict:
+    """
+    Optimize one image; outputs are written through run (or a run of its own).
+    quick skips the PNG optimize pass, which dominates the time on large PNGs.
+    "ok" is False when it failed; with its own run, also when the outputs were
+    dropped because another run changed the file meanwhile.
+    """
+    if run is None:
+        with StagedRun("optimize-images") as run:
+            result = optimize_image(filepath, verify, run, quick)
+        return {**result, "ok": False} if filepath in run.conflicts else result
+
     filename = filepath.name
     settings = get_settings(filename)
 
     try:
-        with Image.open(filepath) as img:
-            original_size = filepath.stat().st_size
+        original_size = filepath.stat().st_size
+
+        # Decode + resize in one go (JPEG draft / reducing_gap fast path)
+        with run.read(filepath):
+            img, resize_info = open_resized(filepath, max_width=settings["max_width"], guard=verify)
 
+        with img:
             # Convert RGBA to RGB for JPEG
             if img.mode == 'RGBA' and filepath.suffix.lower() in ['.jpg', '.jpeg']:
                 img = img.convert('RGB')
 
-            # Resize if larger than max_width
-            if img.width > settings["max_width"]:
-                ratio = settings["max_width"] / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((settings["max_width"], new_height), Image.Resampling.LANCZOS)
-
-            # Save optimized image
+            # Save optimized image: all encodes of this frame run concurrently
+            # Written to the run's staging dir, swapped into place when it commits
+            output = run.stage(filepath)
+            measures = []
             if filepath.suffix.lower() == '.png':
                 # For PNGs, also create WebP version
-                img.save(filepath, optimize=True)
-                webp_path = filepath.with_suffix('.webp')
-                img.save(webp_path, 'WEBP', quality=settings["quality"])
+                webp_path = run.stage(filepath.with_suffix('.webp'), source=filepath)
+                jobs = {
+                    "png": lambda im=img.copy(): im.save(output, optimize=not quick),
+                    "webp": lambda im=img.copy(): im.save(webp_path, 'WEBP', quality=settings["quality"]),
+                }
+            elif settings.get("progressive") or settings.get("subsampling"):
+                jobs, measures = photo_jpeg_jobs(img, output, settings)
             else:
-                img.save(filepath, quality=settings["quality"], optimize=True)
+                jobs = {"jpeg": lambda: img.save(output, quality=settings["quality"], optimize=True)}
+
+            start = time.perf_counter()
+            results = encode_all(jobs)
+            wall = time.perf_counter() - start
+            saved = bytes_saved(results, measures) if measures else {}
+            encode_times = {name: seconds for name, (_, seconds) in results.items()}
 
-            new_size = filepath.stat().st_size
+            new_size = output.stat().st_size
             reduction = (1 - new_size / original_size) * 100
 
             print(f"[OK] {filename}: {original_size/1024:.0f}KB -> {new_size/1024:.0f}KB ({reduction:.1f}% smaller)")
+            if resize_info["psnr"] is not None:
+                print(f"     resize: {resize_info['path']}, {resize_info['psnr']:.1f} dB vs single-pass")
+            if saved:
+                print("     " + ", ".join(f"{k}: {v/1024:.1f}KB" for k, v in saved.items()))
+            times = ", ".join(f"{k} {v*1000:.0f}ms" for k, v in encode_times.items())
+            print(f"     encode: {times} (wall {wall*1000:.0f}ms)")
+            return {"ok": True, "saved": saved, "encode": encode_times}
 
     except Exception as e:
         print(f"[ERR] {filename}: Error - {e}")
+        run.drop(filepath)  # no half-written PNG/WebP pair
+        return {"ok": False, "saved": {}, "encode": {}}
+
+def benchmark(image_files, repeat: int = 3) -> None:
+    """Time single-pass LANCZOS against the fast resize path, per SETTINGS profile."""
+    print(f"Resize benchmark (best of {repeat}, files that need resizing)\n")
+    print(f"{'profile':<10} {'files':>5} {'single':>9} {'fast':>9} {'speedup':>8} {'min PSNR':>9}")
+
+    profiles = {prefix: [] for prefix in [*SETTINGS, "default"]}
+    for filepath in image_files:
+        prefix = next((p for p in SETTINGS if filepath.name.startswith(p)), "default")
+        profiles[prefix].append(filepath)
+
+    for prefix, files in profiles.items():
+        single_total = fast_total = 0.0
+        min_psnr = float("inf")
+        count = 0
+
+        for filepath in files:
+            max_width = get_settings(filepath.name)["max_width"]
+            # Same orientation-aware target as open_resized
+            with Image.open(filepath) as img:
+                if stored_target_size(img, max_width=max_width) == img.size:
+                    continue
+
+            single_best = fast_best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                with Image.open(filepath) as img:
+                    reference = single_pass(img, stored_target_size(img, max_width=max_width))
+                reference = ImageOps.exif_transpose(reference)  # open_resized returns it upright
+                single_best = min(single_best, time.perf_counter() - start)
+
+                start = time.perf_counter()
+                fast, _ = open_resized(filepath, max_width=max_width)
+                fast_best = min(fast_best, time.perf_counter() - start)
+
+            single_total += single_best
+            fast_total += fast_best
+            min_psnr = min(min_psnr, psnr(reference, fast))
+            count += 1
+
+        if not count:
+            print(f"{prefix:<10} {0:>5} {'-':>9} {'-':>9} {'-':>8} {'-':>9}")
+            continue
+        print(f"{prefix:<10} {count:>5} {single_total*1000:>7.0f}ms {fast_total*1000:>7.0f}ms "
+              f"{single_total/fast_total:>7.2f}x {min_psnr:>9.1f}")
 
 def main():
-    print("Optimizing images for web...\n")
+    parser = argparse.ArgumentParser(description="Optimize images for web")
+    parser.add_argument("--verify", action="store_true",
+                        help="compare fast resizes against single-pass LANCZOS (slower)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time the resize engine per SETTINGS profile, write nothing")
+    parser.add_argument("--hashed", action="store_true",
+                        help="also write content-hashed copies, the image manifest and vercel.json headers "
+                             "(refreshed on every run once the manifest is in use)")
+    args = parser.parse_args()
 
-    image_files = list(IMAGES_DIR.glob("*.jpg")) + list(IMAGES_DIR.glob("*.png"))
+    image_files = [f for f in list(IMAGES_DIR.glob("*.jpg")) + list(IMAGES_DIR.glob("*.png"))
+                   if not is_hashed(f)]
 
     if not image_files:
         print("No images found to optimize.")
         return
 
+    if args.benchmark:
+        benchmark(sorted(image_files))
+        return
+
+    print("Optimizing images for web...\n")
+
+    encode_threads = configure_encoders(processes=1)
+
     total_before = sum(f.stat().st_size for f in image_files)
 
-    for filepath in sorted(image_files):
-        optimize_image(filepath)
+    saved_by_measure = {}
+    encode_by_format = {}
+    with StagedRun("optimize-images") as run:
+        for filepath in sorted(image_files):
+            result = optimize_image(filepath, verify=args.verify, run=run)
+            for measure, saved in result["saved"].items():
+                saved_by_measure[measure] = saved_by_measure.get(measure, 0) + saved
+            for fmt, seconds in result["encode"].items():
+                encode_by_format[fmt] = encode_by_format.get(fmt, 0) + seconds
 
     total_after = sum(f.stat().st_size for f in image_files)
 
     print(f"\nTotal: {total_before/1024/1024:.1f}MB -> {total_after/1024/1024:.1f}MB")
     print(f"Saved: {(total_before - total_after)/1024/1024:.1f}MB ({(1 - total_after/total_before)*100:.1f}%)")
+    for measure, saved in saved_by_measure.items():
+        print(f"  JPEG {measure}: {saved/1024:.1f}KB")
+    print(f"Encode time ({encode_threads} threads): "
+          + ", ".join(f"{k} {v:.1f}s" for k, v in encode_by_format.items()))
+
+    # Components resolve through the manifest: re-encoded files need fresh hashed copies
+    if args.hashed or manifest_in_use():
+        copies = refresh_hashed(image_files)
+        update_vercel_headers()
+        print(f"\nHashed copies: {len(copies)} (manifest + vercel.json headers updated)")
+
+    preloaded = update_index_html()
+    if preloaded:
+        print(f"LCP preload: {preloaded}")
 
 if __name__ == "__main__":
     main()
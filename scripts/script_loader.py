@@ -0,0 +1,14 @@
+"""Import the hyphenated scripts (fix-transparency.py, ...) as modules."""
+
+import importlib.util
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def load_script(name: str, filename: str):
+    """Import SCRIPTS_DIR / filename under the given module name."""
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
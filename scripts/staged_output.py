@@ -0,0 +1,174 @@
+"""
+Per-asset advisory locks and staged outputs for scripts sharing public/.
+
+Outputs are written to a private staging directory and moved into place
+with os.replace() when the run commits, so readers only ever see complete
+files. Every asset is guarded by an fcntl lock: reads take it shared, the
+swap takes it exclusive. Locks are never nested, so overlapping runs can't
+deadlock; if a source changed after this run read it, the run's outputs
+for that asset are dropped instead of overwriting the newer work. Dropped
+sources are listed in run.conflicts, and a strict run raises StaleSource
+so single-asset callers record a failure instead of a success.
+"""
+
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+LOCK_DIR = ROOT / ".cache" / "locks"
+STAGING_DIR = ROOT / ".cache" / "staging"  # same filesystem as public/, so os.replace is atomic
+
+
+@contextmanager
+def asset_lock(path: Path, shared: bool = False):
+    """Advisory lock on one asset (held on a lock file, the asset may not exist yet)."""
+    LOCK_DIR.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha256(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:16]
+    with open(LOCK_DIR / f"{key}.lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class StaleSource(RuntimeError):
+    """A strict run's outputs were dropped because their source changed meanwhile."""
+
+    def __init__(self, name: str, sources: list):
+        self.sources = sources
+        super().__init__(f"{', '.join(s.name for s in sources)} changed by another run, {name} output discarded")
+
+
+def signature(path: Path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _fsync(path: Path, directory: bool = False):
+    fd = os.open(path, os.O_RDONLY if directory else os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def rewrite_shared(path: Path, update) -> str:
+    """
+    Read-modify-write a shared text file (manifest, index.html) under its
+    exclusive lock; update(old text or None) returns the new text, which
+    replaces the file atomically. Returns the new text.
+    """
+    path = Path(path)
+    with asset_lock(path):
+        old = path.read_text(encoding="utf-8") if path.exists() else None
+        new = update(old)
+        if new != old:
+            STAGING_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=f"{path.name}-", dir=STAGING_DIR)
+            os.fchmod(fd, path.stat().st_mode & 0o777 if old is not None else 0o644)  # mkstemp is 0600
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(new)
+            _fsync(Path(tmp))
+            os.replace(tmp, path)
+            _fsync(path.parent, directory=True)
+    return new
+
+
+class StagedRun:
+    """
+    One run's staged outputs, grouped by the source asset they derive from.
+
+        with StagedRun("optimize-images") as run:
+            with run.read(src):
+                img = load(src)
+            img.save(run.stage(src))
+            img.save(run.stage(src.with_suffix(".webp"), source=src))
+
+    Leaving the block commits; an exception discards everything staged. A
+    failure half-way through one asset should drop() it so the rest of the
+    run still commits without that asset's partial outputs.
+    """
+
+    def __init__(self, name: str, strict: bool = False):
+        STAGING_DIR.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.strict = strict
+        self.dir = Path(tempfile.mkdtemp(prefix=f"{name}-", dir=STAGING_DIR))
+        self.groups = {}
+        self.conflicts = []
+        self.signatures = {}  # source -> signature as this run left it (read, or written by the commit)
+        self._staged = 0
+
+    def _group(self, source: Path) -> dict:
+        return self.groups.setdefault(Path(source), {"seen": signature(Path(source)), "outputs": {}})
+
+    @contextmanager
+    def read(self, source: Path):
+        """Read source under a shared lock and remember the version that was read."""
+        with asset_lock(source, shared=True):
+            self._group(source)
+            yield source
+
+    def stage(self, target: Path, source: Path = None) -> Path:
+        """Private path to write target to; it replaces target on commit."""
+        group = self._group(source or target)
+        self._staged += 1
+        staged = self.dir / f"{self._staged}-{Path(target).name}"
+        group["outputs"][Path(target)] = staged
+        return staged
+
+    def drop(self, source: Path):
+        """Forget everything staged for source (its processing failed)."""
+        group = self.groups.pop(Path(source), None)
+        if group:
+            self.signatures[Path(source)] = group["seen"]
+            for tmp in group["outputs"].values():
+                tmp.unlink(missing_ok=True)
+
+    def commit(self) -> list:
+        """Swap staged files into place; returns sources skipped because they changed meanwhile."""
+        for source, group in self.groups.items():
+            self.signatures[source] = group["seen"]
+            staged = {target: tmp for target, tmp in group["outputs"].items() if tmp.exists()}
+            if not staged:
+                continue
+
+            with asset_lock(source):
+                if signature(source) != group["seen"]:
+                    self.conflicts.append(source)
+                    continue
+                for target, tmp in staged.items():
+                    _fsync(tmp)
+                    os.replace(tmp, target)
+                for parent in {target.parent for target in staged}:
+                    _fsync(parent, directory=True)
+                self.signatures[source] = signature(source)
+
+        self.discard()
+        return self.conflicts
+
+    def discard(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.discard()
+            return False
+        conflicts = self.commit()
+        if conflicts and self.strict:
+            raise StaleSource(self.name, conflicts)
+        for source in conflicts:
+            print(f"[SKIP] {source.name}: changed by another run, {self.name} output discarded")
+        return False
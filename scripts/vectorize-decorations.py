@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Fit the generated decoration bitmaps with tiny parametric models.
+Tries a linear / radial CSS gradient, blurred SVG circles and an SVG Bezier
+wave, scores each against the bitmap and records the best fit in
+asset-manifest.json. Good fits are written as CSS or public/images/vector/*.svg.
+"""
+
+import argparse
+import math
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from asset_manifest import update_section
+from staged_output import StagedRun
+
+IMAGES_DIR = Path(__file__).parent.parent / "public" / "images"
+VECTOR_DIR = IMAGES_DIR / "vector"
+
+# Outputs of generate-decorations.py
+DECORATIONS = ["gradient-blob.png", "floating-circles.png", "wave-divider.png"]
+
+FIT_SIZE = 128        # models are fitted and scored on a thumbnail
+STOPS = 5             # gradient stops
+MIN_SCORE = 0.96      # 1 - RMSE of the result composited on white
+MAX_CIRCLES = 8
+WAVE_POINTS = 7       # boundary samples joined with Bezier curves
+
+
+# --- helpers -----------------------------------------------------------------
+
+def load_premultiplied(path: Path):
+    """Thumbnail as float premultiplied RGBA in 0..1, plus the original size."""
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+        size = img.size
+        img.thumbnail((FIT_SIZE, FIT_SIZE), Image.Resampling.LANCZOS)
+        arr = np.asarray(img, dtype=np.float32) / 255
+
+    alpha = arr[:, :, 3:]
+    return np.dstack([arr[:, :, :3] * alpha, alpha]), size
+
+
+def composite(premul):
+    """Premultiplied RGBA over a white page."""
+    return premul[:, :, :3] + (1 - premul[:, :, 3:])
+
+
+def similarity(target, fitted) -> float:
+    rmse = math.sqrt(float(np.mean((composite(target) - composite(fitted)) ** 2)))
+    return 1 - rmse
+
+
+def strength_map(premul):
+    """How far each pixel is from the page: alpha if present, else distance from white."""
+    alpha = premul[:, :, 3]
+    if alpha.min() < 0.99:
+        return alpha
+    return np.clip(np.abs(1 - premul[:, :, :3]).max(axis=2) * 2, 0, 1)
+
+
+def hat_basis(t, count):
+    positions = np.linspace(0, 1, count)
+    return np.clip(1 - np.abs(t[:, None] - positions[None, :]) * (count - 1), 0, 1)
+
+
+def fit_stops(t, values, count=STOPS):
+    """Least-squares premultiplied stop colours for samples at gradient positions t."""
+    stops, *_ = np.linalg.lstsq(hat_basis(t, count), values, rcond=None)
+    return np.clip(stops, 0, 1)
+
+
+def unpremultiply(stop):
+    alpha = float(stop[3])
+    rgb = stop[:3] / alpha if alpha > 1e-3 else stop[:3]
+    return tuple(int(round(v * 255)) for v in np.clip(rgb, 0, 1)), alpha
+
+
+def css_color(stop) -> str:
+    (r, g, b), alpha = unpremultiply(stop)
+    if alpha >= 0.98:
+        return f"#{r:02x}{g:02x}{b:02x}"
+    return f"rgba({r},{g},{b},{alpha:.2f})"
+
+
+def svg_color(stop) -> str:
+    (r, g, b), alpha = unpremultiply(stop)
+    opacity = "" if alpha >= 0.98 else f' stop-opacity="{alpha:.2f}"'
+    return f'stop-color="#{r:02x}{g:02x}{b:02x}"{opacity}'
+
+
+def css_stops(stops) -> str:
+    positions = np.linspace(0, 100, len(stops))
+    return ",".join(f"{css_color(s)} {p:.0f}%" for s, p in zip(stops, positions))
+
+
+def grid(premul, size):
+    """Pixel-centre coordinates of the thumbnail in original image units."""
+    h, w = premul.shape[:2]
+    width, height = size
+    ys, xs = np.mgrid[0:h, 0:w].astype(np.float32)
+    return (xs + 0.5) * width / w, (ys + 0.5) * height / h
+
+
+# --- models ------------------------------------------------------------------
+
+def fit_linear(premul, size):
+    width, height = size
+    xs, ys = grid(premul, size)
+    values = premul.reshape(-1, 4)
+    best = None
+
+    # CSS angles: 0deg points up, 90deg right; opposite angles are the same fit
+    for angle in range(0, 180, 15):
+        rad = math.radians(angle)
+        dx, dy = math.sin(rad), -math.cos(rad)
+        length = abs(width * dx) + abs(height * dy)
+        t = np.clip(((xs - width / 2) * dx + (ys - height / 2) * dy) / length + 0.5, 0, 1).ravel()
+
+        stops = fit_stops(t, values)
+        fitted = (hat_basis(t, STOPS) @ stops).reshape(premul.shape)
+        score = similarity(premul, fitted)
+        if best is None or score > best["score"]:
+            best = {"score": score, "css": f"linear-gradient({angle}deg,{css_stops(stops)})"}
+
+    return {"model": "linear-gradient", **best}
+
+
+def fit_radial(premul, size):
+    width, height = size
+    xs, ys = grid(premul, size)
+    strength = strength_map(premul)
+    total = strength.sum()
+    if total == 0:
+        return None
+
+    cx, cy = float((xs * strength).sum() / total), float((ys * strength).sum() / total)
+    radius = max(math.hypot(cx - x, cy - y) for x in (0, width) for y in (0, height))
+    t = np.clip(np.hypot(xs - cx, ys - cy) / radius, 0, 1).ravel()
+
+    stops = fit_stops(t, premul.reshape(-1, 4))
+    fitted = (hat_basis(t, STOPS) @ stops).reshape(premul.shape)
+    at = f"{cx / width * 100:.0f}% {cy / height * 100:.0f}%"
+    return {
+        "model": "radial-gradient",
+        "score": similarity(premul, fitted),
+        "css": f"radial-gradient(circle farthest-corner at {at},{css_stops(stops)})",
+    }
+
+
+def find_blobs(strength):
+    """Connected regions of the strength map, largest first."""
+    # copy(): fromarray images are read-only views and floodfill would be a no-op
+    mask = Image.fromarray(((strength > 0.1) * 255).astype(np.uint8), "L").copy()
+    labels = np.zeros(strength.shape, dtype=np.int32)
+    blobs = []
+
+    for label in range(1, 250):
+        remaining = np.argwhere((np.asarray(mask) == 255) & (labels == 0))
+        if len(remaining) == 0:
+            break
+        y, x = remaining[0]
+        ImageDraw.floodfill(mask, (int(x), int(y)), label)
+        region = np.asarray(mask) == label
+        labels[region] = label
+        if region.sum() >= 4:
+            blobs.append(region)
+
+    return sorted(blobs, key=lambda r: r.sum(), reverse=True)
+
+
+def render_circles(circles, shape, size):
+    """Render circles (in original units) at thumbnail resolution, premultiplied."""
+    h, w = shape[:2]
+    scale = w / size[0]
+    canvas = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    for c in circles:
+        layer = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        r = c["r"] * scale
+        box = [c["cx"] * scale - r, c["cy"] * scale - r, c["cx"] * scale + r, c["cy"] * scale + r]
+        ImageDraw.Draw(layer).ellipse(box, fill=(*c["rgb"], int(round(c["opacity"] * 255))))
+        if c["blur"] > 0:
+            layer = layer.filter(ImageFilter.GaussianBlur(c["blur"] * scale))
+        canvas = Image.alpha_composite(canvas, layer)
+
+    arr = np.asarray(canvas, dtype=np.float32) / 255
+    alpha = arr[:, :, 3:]
+    return np.dstack([arr[:, :, :3] * alpha, alpha])
+
+
+def fit_circles(premul, size):
+    strength = strength_map(premul)
+    blobs = find_blobs(strength)[:MAX_CIRCLES]
+    if not blobs:
+        return None
+
+    xs, ys = grid(premul, size)
+    scale = size[0] / premul.shape[1]
+    circles = []
+    for region in blobs:
+        weight = strength * region
+        total = weight.sum()
+        core = region & (strength > 0.5 * strength[region].max())
+        soft_r = math.sqrt(region.sum() / math.pi) * scale
+        core_r = math.sqrt(max(core.sum(), 1) / math.pi) * scale
+
+        colour = (premul[core][:, :3].sum(axis=0) / max(premul[core][:, 3].sum(), 1e-3))
+        circles.append({
+            "cx": float((xs * weight).sum() / total),
+            "cy": float((ys * weight).sum() / total),
+            "r": core_r,
+            "blur": max(0.0, (soft_r - core_r) / 2),
+            "rgb": tuple(int(round(v * 255)) for v in np.clip(colour, 0, 1)),
+            "opacity": float(np.clip(premul[core][:, 3].mean(), 0, 1)) if premul[:, :, 3].min() < 0.99
+                       else float(np.clip(strength[core].mean(), 0, 1)),
+        })
+
+    fitted = render_circles(circles, premul.shape, size)
+    width, height = size
+    defs, shapes = [], []
+    for i, c in enumerate(circles):
+        blur = ""
+        if c["blur"] >= 0.5:
+            defs.append(f'<filter id="b{i}"><feGaussianBlur stdDeviation="{c["blur"]:.0f}"/></filter>')
+            blur = f' filter="url(#b{i})"'
+        r, g, b = c["rgb"]
+        opacity = "" if c["opacity"] >= 0.98 else f' fill-opacity="{c["opacity"]:.2f}"'
+        shapes.append(f'<circle cx="{c["cx"]:.0f}" cy="{c["cy"]:.0f}" r="{c["r"]:.0f}" '
+                      f'fill="#{r:02x}{g:02x}{b:02x}"{opacity}{blur}/>')
+
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}">'
+           f'{"<defs>" + "".join(defs) + "</defs>" if defs else ""}{"".join(shapes)}</svg>')
+    return {"model": "circles", "score": similarity(premul, fitted), "svg": svg}
+
+
+def bezier_path(points):
+    """Catmull-Rom through points as cubic Bezier segments: (start, [(c1, c2, end), ...])."""
+    segments = []
+    for i in range(len(points) - 1):
+        p0 = points[max(i - 1, 0)]
+        p1, p2 = points[i], points[i + 1]
+        p3 = points[min(i + 2, len(points) - 1)]
+        c1 = (p1[0] + (p2[0] - p0[0]) / 6, p1[1] + (p2[1] - p0[1]) / 6)
+        c2 = (p2[0] - (p3[0] - p1[0]) / 6, p2[1] - (p3[1] - p1[1]) / 6)
+        segments.append((c1, c2, p2))
+    return points[0], segments
+
+
+def flatten(start, segments, steps=16):
+    points = [start]
+    for c1, c2, end in segments:
+        p0 = points[-1]
+        for s in range(1, steps + 1):
+            t = s / steps
+            mt = 1 - t
+            points.append((
+                mt ** 3 * p0[0] + 3 * mt ** 2 * t * c1[0] + 3 * mt * t ** 2 * c2[0] + t ** 3 * end[0],
+                mt ** 3 * p0[1] + 3 * mt ** 2 * t * c1[1] + 3 * mt * t ** 2 * c2[1] + t ** 3 * end[1],
+            ))
+    return points
+
+
+def fit_wave(premul, size):
+    """A filled area under a smooth top edge, coloured with a horizontal gradient."""
+    width, height = size
+    h, w = premul.shape[:2]
+    mask = strength_map(premul) > 0.5
+    filled = mask.any(axis=0)
+    if filled.sum() < w // 2:
+        return None
+
+    # Top boundary per column from its coverage (sub-pixel), in original units
+    coverage = np.clip(strength_map(premul), 0, 1).sum(axis=0)
+    tops = (h - coverage) * height / h
+    sample_x = np.linspace(0, w - 1, WAVE_POINTS).astype(int)
+    points = [(float(x * width / (w - 1)), float(tops[x])) for x in sample_x]
+    start, segments = bezier_path(points)
+
+    xs, _ = grid(premul, size)
+    t = (xs / width)[mask]
+    stops = fit_stops(t, premul[mask])
+
+    # Render: polygon under the curve filled with the gradient
+    outline = flatten(start, segments) + [(width, height), (0, height)]
+    # 4x supersampled so the edge is antialiased like the thumbnail
+    scale = 4 * w / width
+    shape_img = Image.new("L", (4 * w, 4 * h), 0)
+    ImageDraw.Draw(shape_img).polygon([(x * scale, y * scale) for x, y in outline], fill=255)
+    shape_img = shape_img.resize((w, h), Image.Resampling.BOX)
+    coverage = np.asarray(shape_img, dtype=np.float32)[:, :, None] / 255
+    colours = (hat_basis((xs / width).ravel(), STOPS) @ stops).reshape(premul.shape)
+    fitted = colours * coverage
+
+    d = f"M0,{height} L{start[0]:.0f},{start[1]:.0f} " + " ".join(
+        f"C{c1[0]:.0f},{c1[1]:.0f} {c2[0]:.0f},{c2[1]:.0f} {e[0]:.0f},{e[1]:.0f}" for c1, c2, e in segments
+    ) + f" L{width},{height}Z"
+    gradient = "".join(f'<stop offset="{p:.2f}" {svg_color(s)}/>'
+                       for s, p in zip(stops, np.linspace(0, 1, STOPS)))
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" preserveAspectRatio="none">'
+           f'<defs><linearGradient id="g">{gradient}</linearGradient></defs>'
+           f'<path d="{d}" fill="url(#g)"/></svg>')
+    return {"model": "wave", "score": similarity(premul, fitted), "svg": svg}
+
+
+MODELS = [fit_linear, fit_radial, fit_circles, fit_wave]
+
+
+def vectorize(path: Path, min_score: float, run: StagedRun) -> dict:
+    """Fit every model to path; an accepted SVG is staged through run."""
+    with run.read(path):
+        premul, size = load_premultiplied(path)
+        original_bytes = path.stat().st_size
+    fits = [fit for fit in (model(premul, size) for model in MODELS) if fit]
+    best = max(fits, key=lambda f: f["score"])
+
+    output = best.get("css") or best["svg"]
+    record = {
+        "model": best["model"],
+        "score": round(best["score"], 4),
+        "scores": {f["model"]: round(f["score"], 4) for f in fits},
+        "original_bytes": original_bytes,
+        "bytes": len(output.encode("utf-8")),
+        "accepted": best["score"] >= min_score,
+    }
+
+    if record["accepted"]:
+        if "css" in best:
+            record["css"] = best["css"]
+        else:
+            VECTOR_DIR.mkdir(parents=True, exist_ok=True)
+            svg_path = VECTOR_DIR / f"{path.stem}.svg"
+            run.stage(svg_path, source=path).write_text(best["svg"], encoding="utf-8")
+            record["svg"] = "/" + svg_path.relative_to(IMAGES_DIR.parent).as_posix()
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace decorative bitmaps with CSS/SVG fits")
+    parser.add_argument("files", nargs="*", help=f"images to analyse (default: {', '.join(DECORATIONS)})")
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE)
+    args = parser.parse_args()
+
+    paths = [Path(f) for f in args.files] or [IMAGES_DIR / name for name in DECORATIONS]
+    entries = {}
+
+    # SVGs are swapped into public/images/vector together at the end of the run
+    with StagedRun("vectorize-decorations") as run:
+        for path in paths:
+            if not path.exists():
+                print(f"[SKIP] {path.name}: not found")
+                continue
+
+            record = vectorize(path, args.min_score, run)
+            entries[path.name] = record
+            sizes = f"{record['original_bytes']/1024:.0f}KB -> {record['bytes']}B"
+            if record["accepted"]:
+                print(f"[OK] {path.name}: {record['model']}, score {record['score']:.3f}, {sizes}")
+            else:
+                print(f"[SKIP] {path.name}: best {record['model']} scored {record['score']:.3f} < {args.min_score}")
+
+    # Fits of sources that changed meanwhile describe the old image
+    for source in run.conflicts:
+        entries.pop(source.name, None)
+
+    if entries:
+        update_section("decorations", entries)
+        print("\nRecorded in asset-manifest.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Watch public/images, public/education and public/mastermode and reprocess
+only the files that changed (fix-transparency for public/images, the batch
+script's scope, then optimize-images, then the hashed copies once the
+image manifest is in use).
+Uses inotify through watchdog when installed, polling otherwise. Work runs
+on a warm process pool so imports are paid once per worker.
+
+PNGs are written without the optimize pass (seconds on large files) unless
+--full is given; run optimize-images.py before deploying for final sizes.
+"""
+
+import argparse
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import encode_pool
+from asset_hash import is_hashed, manifest_in_use, refresh_hashed
+from lcp_preload import update_index_html
+from script_loader import SCRIPTS_DIR, load_script
+from staged_output import StagedRun
+
+PUBLIC_DIR = SCRIPTS_DIR.parent / "public"
+IMAGES_DIR = PUBLIC_DIR / "images"
+WATCH_DIRS = [IMAGES_DIR, PUBLIC_DIR / "education", PUBLIC_DIR / "mastermode"]
+
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+DEBOUNCE = 0.3  # seconds of quiet before a file is reprocessed
+POLL_INTERVAL = 0.5
+
+# Loaded once per worker by _warm_worker
+_fix = None
+_opt = None
+
+
+def _warm_worker(processes: int):
+    global _fix, _opt
+    # Share the IMAGE_WORKERS budget with the other worker processes
+    encode_pool.configure(processes)
+    _fix = load_script("fix_transparency", "fix-transparency.py")
+    _opt = load_script("optimize_images", "optimize-images.py")
+
+
+def _ping(_=None):
+    return os.getpid()
+
+
+def process_asset(path_str: str, quick: bool = True):
+    """
+    Run the pipeline stages for one changed file inside a worker.
+    Also returns the file's signature as the pipeline left it (what it read,
+    or what it wrote); a different file on disk is an edit made mid-job.
+    """
+    path = Path(path_str)
+    start = time.perf_counter()
+    stages = []
+
+    # Same scope as fix-transparency.py; the detector decides whether removal runs
+    if path.suffix.lower() == ".png" and path.parent == IMAGES_DIR:
+        with StagedRun("fix-transparency") as run:
+            fixed = _fix.fix_transparency(path, run=run, quick=quick)
+        if path in run.conflicts:
+            return path_str, stages, time.perf_counter() - start, run.signatures[path]
+        if fixed:
+            stages.append("transparency")
+
+    with StagedRun("optimize-images") as run:
+        ok = _opt.optimize_image(path, run=run, quick=quick)["ok"]
+    if ok and path not in run.conflicts:
+        stages.append("optimize")
+        # Components resolve public/images through the manifest; keep it on the new bytes
+        if path.parent == IMAGES_DIR and manifest_in_use():
+            refresh_hashed([path])
+            stages.append("hashed")
+
+    return path_str, stages, time.perf_counter() - start, run.signatures.get(path, signature(path))
+
+
+def is_source(path: Path) -> bool:
+    return (path.suffix.lower() in SOURCE_SUFFIXES
+            and ".tmp" not in path.suffixes
+            and not is_hashed(path))
+
+
+def signature(path: Path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def snapshot() -> dict:
+    files = {}
+    for directory in WATCH_DIRS:
+        if directory.is_dir():
+            for path in directory.iterdir():
+                if is_source(path):
+                    files[path] = signature(path)
+    return files
+
+
+def start_inotify(events: queue.Queue):
+    """Feed changed paths into events via watchdog; None if it isn't installed."""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            events.put(Path(getattr(event, "dest_path", "") or event.src_path))
+
+    observer = Observer()
+    for directory in WATCH_DIRS:
+        if directory.is_dir():
+            observer.schedule(Handler(), str(directory), recursive=False)
+    observer.start()
+    return observer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally reprocess changed images")
+    parser.add_argument("--poll", action="store_true", help="force the polling watcher")
+    parser.add_argument("--workers", type=int, default=min(4, encode_pool.WORKER_BUDGET))
+    parser.add_argument("--full", action="store_true",
+                        help="optimize PNGs fully like the batch scripts (slower)")
+    args = parser.parse_args()
+
+    pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_warm_worker, initargs=(args.workers,))
+    # Start every worker now so the first edit doesn't pay for imports
+    list(pool.map(_ping, range(args.workers)))
+
+    events = queue.Queue()
+    observer = None if args.poll else start_inotify(events)
+    known = snapshot()  # signature of each file as last processed
+    polled = dict(known)
+
+    print(f"Watching: {', '.join(str(d.relative_to(PUBLIC_DIR.parent)) for d in WATCH_DIRS if d.is_dir())}")
+    print(f"Mode: {'inotify' if observer else 'polling'}, workers: {args.workers} (Ctrl+C to stop)\n")
+
+    pending = {}    # path -> time of last event
+    in_flight = {}  # path -> future
+    last_poll = 0.0
+
+    try:
+        while True:
+            now = time.monotonic()
+
+            if observer is None and now - last_poll >= POLL_INTERVAL:
+                last_poll = now
+                current = snapshot()
+                for path, sig in current.items():
+                    if polled.get(path) != sig:
+                        events.put(path)
+                polled = current
+
+            while True:
+                try:
+                    path = events.get(timeout=0.05)
+                except queue.Empty:
+                    break
+                # Our own outputs come back as events; same signature means nothing new
+                if is_source(path) and path.exists() and known.get(path) != signature(path):
+                    pending[path] = time.monotonic()
+
+            for path, future in list(in_flight.items()):
+                if not future.done():
+                    continue
+                del in_flight[path]
+                try:
+                    name, stages, elapsed, seen = future.result()
+                except Exception as e:
+                    known[path] = signature(path)
+                    print(f"[ERR] {path.name}: {e}")
+                    continue
+
+                # The version the job processed, so an edit saved mid-job still counts as new
+                known[path] = seen
+                if stages:
+                    print(f"[OK] {Path(name).name}: {' + '.join(stages)} in {elapsed*1000:.0f}ms")
+                    update_index_html()  # variants may have changed under the LCP hint
+                if seen != signature(path):
+                    print(f"[SKIP] {path.name}: changed while processing, queued again")
+                    pending[path] = time.monotonic()
+
+            now = time.monotonic()
+            for path, last_event in list(pending.items()):
+                if now - last_event >= DEBOUNCE and path not in in_flight:
+                    del pending[path]
+                    if known.get(path) != signature(path):
+                        in_flight[path] = pool.submit(process_asset, str(path), not args.full)
+
+    except KeyboardInterrupt:
+        print("\nStopping watcher...")
+    finally:
+        if observer:
+            observer.stop()
+            observer.join()
+        pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import { Paintbrush, Smartphone, Search, Settings, Shield, Headphones } from 'lu
 import { useLanguage } from '../i18n/LanguageContext';
 import { useIntersectionObserver } from '../hooks/useIntersectionObserver';
 import { cn } from '../lib/utils';
+import { resolveAsset } from '../lib/image-manifest';
 
 const iconMap: Record<string, React.ElementType> = {
   design: Paintbrush,
@@ -111,7 +112,7 @@ export function Benefits() {
     <section className="py-24 lg:py-32 relative overflow-hidden">
       <div
         className="absolute inset-0 bg-cover bg-center bg-no-repeat"
-        style={{ backgroundImage: 'url(/images/benefits-bg.webp)' }}
+        style={{ backgroundImage: `url(${resolveAsset('/images/benefits-bg.webp')})` }}
       >
         <div className="absolute inset-0 bg-white/85" />
       </div>
@@ -137,7 +138,7 @@ export function Benefits() {
             >
               <div className="relative aspect-[3/4]">
                 <BenefitsImage
-                  src="/images/benefits-tech.jpg"
+                  src={resolveAsset('/images/benefits-tech.jpg')}
                   alt="Digital technology and web development"
                 />
 
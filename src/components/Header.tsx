@@ -2,6 +2,7 @@ import { useState, useEffect, useRef } from 'react';
 import { Menu, X } from 'lucide-react';
 import { useLanguage } from '../i18n/LanguageContext';
 import { cn } from '../lib/utils';
+import { resolveAsset } from '../lib/image-manifest';
 
 export function Header() {
   const { t, language, setLanguage } = useLanguage();
@@ -50,7 +51,7 @@ export function Header() {
             aria-label="mozart_way - Home"
           >
             <div className="flex items-center justify-center w-10 h-10 bg-gradient-to-br from-violet-500 to-violet-700 rounded-xl shadow-lg overflow-hidden">
-              <img src="/images/logo-icon-white.webp" alt="mozart_way logo" className="w-full h-full object-contain p-1" />
+              <img src={resolveAsset('/images/logo-icon-white.webp')} alt="mozart_way logo" className="w-full h-full object-contain p-1" />
             </div>
             <span className="text-lg font-bold tracking-tight">
               <span className="text-foreground">mozart</span>
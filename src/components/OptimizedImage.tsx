@@ -1,5 +1,6 @@
 import { useState } from 'react';
 import { cn } from '../lib/utils';
+import { resolveAsset } from '../lib/image-manifest';
 
 interface OptimizedImageProps {
   src: string;
@@ -13,6 +14,7 @@ interface OptimizedImageProps {
 /**
  * Optimized image component that uses WebP with fallback.
  * Automatically converts .jpg/.jpeg/.png paths to .webp
+ * and resolves both to their content-hashed copies when available.
  */
 export function OptimizedImage({
   src,
@@ -30,9 +32,9 @@ export function OptimizedImage({
 
   return (
     <picture>
-      {isWebPAvailable && <source srcSet={webpSrc} type="image/webp" />}
+      {isWebPAvailable && <source srcSet={resolveAsset(webpSrc)} type="image/webp" />}
       <img
-        src={src}
+        src={resolveAsset(src)}
         alt={alt}
         loading={loading}
         width={width}
@@ -3,11 +3,12 @@ import { Check, Sparkles, Zap, Rocket, ShoppingCart } from 'lucide-react';
 import { useLanguage } from '../i18n/LanguageContext';
 import { useIntersectionObserver } from '../hooks/useIntersectionObserver';
 import { cn } from '../lib/utils';
+import { resolveAsset } from '../lib/image-manifest';
 
 const serviceImages = [
-  '/images/service-starter.webp',
-  '/images/service-pro.webp',
-  '/images/service-ecommerce.webp',
+  resolveAsset('/images/service-starter.webp'),
+  resolveAsset('/images/service-pro.webp'),
+  resolveAsset('/images/service-ecommerce.webp'),
 ];
 
 // Icons for each package
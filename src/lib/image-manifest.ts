@@ -0,0 +1,10 @@
+import manifest from './image-manifest.json';
+
+/**
+ * Maps a public image path to its content-hashed copy when one exists.
+ * The manifest is generated by `scripts/optimize-images.py --hashed` and kept
+ * current by later optimize and watch runs; hashed paths are served with an immutable Cache-Control (see vercel.json).
+ */
+export function resolveAsset(path: string): string {
+  return (manifest as Record<string, string>)[path] ?? path;
+}
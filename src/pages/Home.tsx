@@ -1,5 +1,6 @@
 import { useEffect } from 'react';
 import siteConfig from '../../site.config.json';
+import { resolveAsset } from '../lib/image-manifest';
 
 export default function Home() {
   useEffect(() => {
@@ -45,7 +46,7 @@ export default function Home() {
           />
           <div className="relative w-[280px] h-[280px] md:w-[420px] md:h-[420px] rounded-full overflow-hidden ring-1 ring-white/10">
             <img
-              src="/images/founder-hero.jpg"
+              src={resolveAsset('/images/founder-hero.jpg')}
               alt="Łukasz Szczurek — Founder, mozartway"
               className="w-full h-full object-cover"
               loading="eager"